@@ -0,0 +1,307 @@
+"""Local Azure OpenAI chat-completions simulator for load and failure testing.
+
+Serves ``POST /openai/deployments/<deployment>/chat/completions`` like the Azure
+service, both as one JSON response and as an SSE stream (``"stream": true``), so the
+app, ``bulk.py`` and the ``openai``/LangChain clients can run against it unchanged::
+
+    python azure_simulator.py --port 8099 --latency-median 1.5 --rate-429 0.05
+    AZURE_OPENAI_ENDPOINT=http://localhost:8099 AZURE_OPENAI_API_KEY=sim streamlit run app3.py
+
+Each request waits a time-to-first-token drawn from a log-normal distribution
+(``--latency-median`` / ``--latency-sigma``), then "generates" at
+``--tokens-per-second``. Faults are drawn per request (``--seed`` makes them
+repeatable):
+
+- ``--rate-429`` and ``--max-concurrent``: 429 with ``Retry-After`` (random, or when
+  more requests are in flight than the simulated quota)
+- ``--rate-5xx``: 500/503 errors
+- ``--rate-stall``: the response (or stream) stops for ``--stall-seconds`` midway
+- ``--rate-truncate``: the completion is cut short with ``finish_reason=length``
+  (completions longer than the request's ``max_tokens`` are always cut)
+
+Prompts asking for JSON get a small valid RFP analysis; other prompts get one heading
+per numbered item in the prompt. ``GET /stats`` returns the request and fault counters.
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from subsections import numbered_items
+from text_utils import estimate_tokens
+
+PATH_RE = re.compile(r"^/openai/deployments/([^/]+)/chat/completions$")
+FILLER = ("Our delivery team will apply proven practices to this requirement, with clear milestones, "
+          "measurable acceptance criteria and weekly reviews with your stakeholders. ").split()
+STREAM_CHUNK_TOKENS = 4
+
+
+class SimulatorSettings:
+    """Latency model and fault rates (one instance per server)"""
+
+    def __init__(self, latency_median: float = 1.0, latency_sigma: float = 0.5, tokens_per_second: float = 50.0,
+                 completion_tokens: int = 400, rate_429: float = 0.0, retry_after: float = 2.0,
+                 max_concurrent: int = 0, rate_5xx: float = 0.0, rate_stall: float = 0.0,
+                 stall_seconds: float = 30.0, rate_truncate: float = 0.0, seed: Optional[int] = None):
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.max_concurrent = max_concurrent
+        self.rate_5xx = rate_5xx
+        self.rate_stall = rate_stall
+        self.stall_seconds = stall_seconds
+        self.rate_truncate = rate_truncate
+        self.random = random.Random(seed)
+
+
+class Simulator:
+    """Request accounting, fault draws and response content"""
+
+    def __init__(self, settings: SimulatorSettings):
+        self.settings = settings
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "streamed": 0, "ok": 0, "throttled": 0, "errors": 0, "stalled": 0,
+                         "truncated": 0, "completion_tokens": 0}
+
+    def _draw(self, rate: float) -> bool:
+        with self._lock:
+            return self.settings.random.random() < rate
+
+    def first_token_delay(self) -> float:
+        with self._lock:
+            return self.settings.latency_median * math.exp(self.settings.random.gauss(0, self.settings.latency_sigma))
+
+    def count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self.counters[counter] += amount
+
+    def admit(self) -> Optional[Tuple[int, Dict, Dict]]:
+        """(status, headers, body) of an injected failure, or None with the request counted in flight.
+
+        The quota check and the in-flight increment share one lock hold, so concurrent
+        requests cannot all pass the check before any of them is counted; every admitted
+        request must be followed by ``release()``.
+        """
+        settings = self.settings
+        with self._lock:
+            self.counters["requests"] += 1
+            over_quota = settings.max_concurrent and self.in_flight >= settings.max_concurrent
+            throttled = over_quota or settings.random.random() < settings.rate_429
+            failed = not throttled and settings.random.random() < settings.rate_5xx
+            if throttled:
+                self.counters["throttled"] += 1
+            elif failed:
+                self.counters["errors"] += 1
+                status = settings.random.choice([500, 503])
+            else:
+                self.in_flight += 1
+        if throttled:
+            retry_after = settings.retry_after
+            return 429, {"Retry-After": str(math.ceil(retry_after)), "retry-after-ms": str(int(retry_after * 1000))}, {
+                "error": {"code": "429", "message": "Requests to the ChatCompletions_Create Operation have exceeded "
+                                                    "the token rate limit of your current tier (simulated)."}}
+        if failed:
+            return status, {}, {"error": {"code": str(status), "message": "The service is temporarily unavailable (simulated)."}}
+        return None
+
+    def release(self):
+        """End of an admitted request"""
+        with self._lock:
+            self.in_flight -= 1
+
+    def completion(self, messages: List[Dict], max_tokens: Optional[int]) -> Tuple[str, str]:
+        """(content, finish_reason) for a request"""
+        prompt = "\n".join(str(message.get("content") or "") for message in messages)
+        if "json" in prompt.lower() and "valid json" in prompt.lower():
+            content = json.dumps({
+                "project_overview": {"title": "Simulated RFP", "description": "Response from the local simulator",
+                                     "type": "Custom Software Development"},
+                "identified_components": ["Web application", "API integration", "Reporting"],
+                "technical_requirements": ["Cloud hosting", "Single sign-on"],
+                "deliverables": ["Working software", "Documentation"],
+            }, indent=2)
+        else:
+            items = numbered_items(prompt) or ["Response"]
+            per_item = max(self.settings.completion_tokens // len(items), 20)
+            sections = []
+            for number, item in enumerate(items, 1):
+                words = [FILLER[i % len(FILLER)] for i in range(int(per_item * 0.75))]
+                sections.append(f"### {number}. {item}\n\n{' '.join(words)}")
+            content = "\n\n".join(sections)
+
+        limit = max_tokens or math.inf
+        if self._draw(self.settings.rate_truncate):
+            limit = min(limit, max(estimate_tokens(content) // 2, 1))
+        if estimate_tokens(content) > limit:
+            self.count("truncated")
+            return content[:int(limit * 4)], "length"
+        return content, "stop"
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self.counters, in_flight=self.in_flight)
+
+
+def _completion_body(completion_id: str, deployment: str, content: str, finish_reason: str, prompt_tokens: int) -> Dict:
+    completion_tokens = estimate_tokens(content)
+    return {
+        "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": deployment,
+        "choices": [{"index": 0, "finish_reason": finish_reason,
+                     "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens},
+    }
+
+
+def _chunk(completion_id: str, deployment: str, delta: Dict, finish_reason: Optional[str] = None) -> Dict:
+    return {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": deployment,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    simulator: Simulator = None  # set by make_server
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: Dict, headers: Optional[Dict] = None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.split("?")[0] == "/stats":
+            self._send_json(200, self.simulator.stats())
+        else:
+            self._send_json(404, {"error": {"code": "404", "message": "Resource not found"}})
+
+    def do_POST(self):
+        match = PATH_RE.match(self.path.split("?")[0])
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"code": "400", "message": "Invalid JSON body"}})
+            return
+        if not match:
+            self._send_json(404, {"error": {"code": "404", "message": "Resource not found"}})
+            return
+
+        simulator = self.simulator
+        failure = simulator.admit()
+        if failure:
+            status, headers, body = failure
+            self._send_json(status, body, headers)
+            return
+
+        try:
+            self._serve(simulator, match.group(1), request)
+        finally:
+            simulator.release()
+
+    def _serve(self, simulator: Simulator, deployment: str, request: Dict):
+        settings = simulator.settings
+        messages = request.get("messages") or []
+        content, finish_reason = simulator.completion(messages, request.get("max_tokens"))
+        prompt_tokens = sum(estimate_tokens(str(message.get("content") or "")) for message in messages)
+        completion_id = f"chatcmpl-sim-{uuid.uuid4().hex[:12]}"
+        stall = simulator._draw(settings.rate_stall)
+        if stall:
+            simulator.count("stalled")
+        simulator.count("completion_tokens", estimate_tokens(content))
+        time.sleep(simulator.first_token_delay())
+
+        if not request.get("stream"):
+            time.sleep(estimate_tokens(content) / settings.tokens_per_second + (settings.stall_seconds if stall else 0))
+            simulator.count("ok")
+            self._send_json(200, _completion_body(completion_id, deployment, content, finish_reason, prompt_tokens))
+            return
+
+        simulator.count("streamed")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        pieces = re.findall(r".{1,%d}" % (STREAM_CHUNK_TOKENS * 4), content, re.DOTALL)
+        events = [_chunk(completion_id, deployment, {"role": "assistant", "content": ""})]
+        events += [_chunk(completion_id, deployment, {"content": piece}) for piece in pieces]
+        events.append(_chunk(completion_id, deployment, {}, finish_reason))
+        try:
+            for i, event in enumerate(events):
+                if stall and i == len(events) // 2:
+                    time.sleep(settings.stall_seconds)
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(STREAM_CHUNK_TOKENS / settings.tokens_per_second)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+            simulator.count("ok")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (e.g. its timeout fired during a stall)
+
+
+def make_server(settings: SimulatorSettings, host: str = "127.0.0.1", port: int = 8099) -> ThreadingHTTPServer:
+    """HTTP server bound to ``host:port`` (port 0 picks a free one); call ``serve_forever()``"""
+    handler = type("BoundSimulatorHandler", (SimulatorHandler,), {"simulator": Simulator(settings)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.simulator = handler.simulator
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Azure OpenAI chat-completions simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-median", type=float, default=1.0, help="median time to first token (s)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="log-normal spread of the first-token delay")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--completion-tokens", type=int, default=400, help="length of non-JSON completions")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=2.0, help="Retry-After sent with 429s (s)")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="simulated quota: 429 above this many in flight")
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--rate-stall", type=float, default=0.0)
+    parser.add_argument("--stall-seconds", type=float, default=30.0)
+    parser.add_argument("--rate-truncate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    settings = SimulatorSettings(
+        latency_median=args.latency_median, latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second, completion_tokens=args.completion_tokens,
+        rate_429=args.rate_429, retry_after=args.retry_after, max_concurrent=args.max_concurrent,
+        rate_5xx=args.rate_5xx, rate_stall=args.rate_stall, stall_seconds=args.stall_seconds,
+        rate_truncate=args.rate_truncate, seed=args.seed,
+    )
+    server = make_server(settings, args.host, args.port)
+    print(f"Azure OpenAI simulator on http://{args.host}:{server.server_port} "
+          f"(set AZURE_OPENAI_ENDPOINT to this URL, any AZURE_OPENAI_API_KEY)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
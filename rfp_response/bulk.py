@@ -0,0 +1,285 @@
+"""Offline bulk processing of many RFPs through batch JSONL request files.
+
+For overnight runs where throughput and cost matter more than latency, every LLM call
+for a set of documents is written to a request file in the OpenAI batch format and
+handed to a submitter, in dependency stages:
+
+1. parse   - one request per document (the parse prompt of the interactive app)
+2. agents  - six requests per parsed document (all agents only need the parse)
+3. continuation rounds for completions that stopped on ``max_tokens``
+
+Results are ingested back into one ``ProposalState`` per document plus its final
+proposal, written to ``<out>/<document>/state.json`` and ``proposal.md``.
+
+Submitters are pluggable: ``AzureBatchSubmitter`` uploads the file to the Azure OpenAI
+Batch API and polls until the output file is ready; ``LocalSubmitter`` answers every
+request in-process (mock outputs by default) for testing::
+
+    python bulk.py rfps/*.pdf --out bulk_runs/2025-03-01 --submitter local
+"""
+import argparse
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from extraction import DOCX_TYPE, PDF_TYPE, TXT_TYPE, extract_text
+from model_routing import CONTINUE_PROMPT, PARSE_ROUTE, stitch
+
+BATCH_ENDPOINT = "/chat/completions"
+FILE_TYPES = {".pdf": PDF_TYPE, ".docx": DOCX_TYPE, ".txt": TXT_TYPE}
+POLL_INTERVAL = 30.0
+TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+
+def batch_line(custom_id: str, route: Dict, messages: List[Dict]) -> Dict:
+    """One request of a batch file"""
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": route["deployment"],
+            "messages": messages,
+            "temperature": route["temperature"],
+            "max_tokens": route["max_tokens"],
+        },
+    }
+
+
+def write_batch(path: str, lines: List[Dict]):
+    with open(path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+def read_results(path: str) -> Dict[str, Dict]:
+    """custom_id -> {"content", "finish_reason", "error"} from a batch output file"""
+    results = {}
+    with open(path, encoding="utf-8") as f:
+        for raw in f:
+            if not raw.strip():
+                continue
+            line = json.loads(raw)
+            response = line.get("response") or {}
+            body = response.get("body") or {}
+            choice = (body.get("choices") or [{}])[0]
+            error = line.get("error") or (body.get("error") if response.get("status_code") != 200 else None)
+            results[line["custom_id"]] = {
+                "content": (choice.get("message") or {}).get("content") or "",
+                "finish_reason": choice.get("finish_reason"),
+                "error": error,
+            }
+    return results
+
+
+class LocalSubmitter:
+    """Answers a batch file in-process with ``respond(request_line) -> content`` (a test stand-in)"""
+
+    def __init__(self, respond: Optional[Callable[[Dict], str]] = None):
+        self.respond = respond or (lambda line: f"Mock batch output for {line['custom_id']}")
+
+    def submit(self, request_path: str, result_path: str) -> str:
+        with open(request_path, encoding="utf-8") as requests, open(result_path, "w", encoding="utf-8") as results:
+            for i, raw in enumerate(requests):
+                line = json.loads(raw)
+                body = {"choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": self.respond(line)}}]}
+                results.write(json.dumps({
+                    "id": f"local-{i}", "custom_id": line["custom_id"],
+                    "response": {"status_code": 200, "request_id": f"local-{i}", "body": body}, "error": None,
+                }) + "\n")
+        return result_path
+
+
+class AzureBatchSubmitter:
+    """Azure OpenAI Batch API: upload, create the batch, poll, download the output file"""
+
+    def __init__(self, client, poll_interval: float = POLL_INTERVAL, completion_window: str = "24h"):
+        self.client = client
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+
+    def submit(self, request_path: str, result_path: str) -> str:
+        with open(request_path, "rb") as f:
+            batch_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id, endpoint=BATCH_ENDPOINT, completion_window=self.completion_window
+        )
+        while batch.status not in TERMINAL_STATES:
+            time.sleep(self.poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+        with open(result_path, "w", encoding="utf-8") as f:
+            f.write(self.client.files.content(batch.output_file_id).text)
+        return result_path
+
+
+def run_stage(stage: str, requests: Dict[str, Tuple[str, List[Dict]]], router, submitter, work_dir: str) -> Dict[str, Dict]:
+    """Submit ``custom_id -> (route name, messages)`` as one batch, then batch the continuations.
+
+    Returns custom_id -> {"content", "finish_reason", "error", "continuations"}.
+    """
+    results: Dict[str, Dict] = {}
+    pending = {custom_id: messages for custom_id, (_, messages) in requests.items()}
+    round_number = 0
+    while pending:
+        suffix = "" if round_number == 0 else f".cont{round_number}"
+        request_path = os.path.join(work_dir, f"{stage}{suffix}.requests.jsonl")
+        result_path = os.path.join(work_dir, f"{stage}{suffix}.results.jsonl")
+        write_batch(request_path, [batch_line(custom_id, router.route(requests[custom_id][0]), messages)
+                                   for custom_id, messages in pending.items()])
+        round_results = read_results(submitter.submit(request_path, result_path))
+
+        next_pending = {}
+        for custom_id, messages in pending.items():
+            result = round_results.get(custom_id, {"content": "", "finish_reason": None, "error": "missing result"})
+            if custom_id in results:
+                previous = results[custom_id]
+                result = dict(result, content=stitch(previous["content"], result["content"]),
+                              continuations=previous["continuations"] + 1)
+            else:
+                result = dict(result, continuations=0)
+            results[custom_id] = result
+            max_continuations = router.route(requests[custom_id][0]).get("max_continuations") or 0
+            if result["finish_reason"] == "length" and result["continuations"] < max_continuations:
+                next_pending[custom_id] = list(requests[custom_id][1]) + [
+                    {"role": "assistant", "content": result["content"]},
+                    {"role": "user", "content": CONTINUE_PROMPT},
+                ]
+        pending = next_pending
+        round_number += 1
+    return results
+
+
+def _document_id(path: str, seen: Dict[str, int]) -> str:
+    base = re.sub(r"[^A-Za-z0-9_-]+", "-", Path(path).stem).strip("-") or "document"
+    seen[base] = seen.get(base, 0) + 1
+    return base if seen[base] == 1 else f"{base}-{seen[base]}"
+
+
+def run_bulk(paths: List[str], out_dir: str, submitter, profile_id: Optional[str] = None) -> List[Dict]:
+    """Parse and run every agent for ``paths`` through batch stages; returns one summary row per document"""
+    # app3 is a Streamlit script; importing it outside ``streamlit run`` renders nothing
+    import app3
+
+    os.makedirs(out_dir, exist_ok=True)
+    profile = app3.get_profile_registry().get(profile_id)
+    system = app3.SimpleLangGraphProposalSystem(app3.AzureOpenAIConfig(), profile)
+    router = system.router
+    documents, summary, seen = {}, [], {}
+
+    for path in paths:
+        doc_id = _document_id(path, seen)
+        try:
+            with open(path, "rb") as f:
+                text = extract_text(f.read(), FILE_TYPES.get(Path(path).suffix.lower(), ""))
+        except (OSError, ValueError) as e:
+            summary.append({"document": doc_id, "path": path, "status": f"extraction failed: {e}"})
+            continue
+        normalized = app3.normalize_text(text).text
+        documents[doc_id] = {"path": path, "text": normalized, "fast": app3.fast_extract(normalized)}
+
+    parse_results = run_stage("parse", {
+        f"{doc_id}:parse": (PARSE_ROUTE, app3.rfp_parse_messages(doc["text"], doc["fast"], profile))
+        for doc_id, doc in documents.items()
+    }, router, submitter, out_dir)
+
+    states, agent_requests = {}, {}
+    for doc_id, doc in documents.items():
+        result = parse_results.get(f"{doc_id}:parse") or {}
+        try:
+            parsed_data = app3.parse_rfp_response(result.get("content", ""), doc["fast"]) if not result.get("error") else None
+        except json.JSONDecodeError:
+            parsed_data = None
+        if not parsed_data:
+            summary.append({"document": doc_id, "path": doc["path"],
+                            "status": f"parse failed: {result.get('error') or 'no JSON in response'}"})
+            continue
+        parsed_data = app3.validate_parsed_data(parsed_data)
+        states[doc_id] = app3.ProposalState(
+            rfp_data=parsed_data,
+            current_agent="completed",
+            agent_outputs={},
+            human_feedback={},
+            feedback_requests=[],
+            completed_agents=[],
+            messages=[],
+            next_action="bulk",
+            source_sections=app3.agent_source_sections(app3.OutlineIndex.build(doc["text"]), doc["text"]),
+            fact_sheet=app3.build_fact_sheet(parsed_data)
+        )
+        for agent_name in app3.SPECULATIVE_AGENTS:
+            prompt = system.build_agent_prompt(agent_name, states[doc_id])
+            agent_requests[f"{doc_id}:{agent_name}"] = (agent_name, [{"role": "user", "content": prompt}])
+
+    agent_results = run_stage("agents", agent_requests, router, submitter, out_dir)
+
+    for doc_id, state in states.items():
+        errors = []
+        for agent_name in app3.SPECULATIVE_AGENTS:
+            result = agent_results.get(f"{doc_id}:{agent_name}") or {"error": "missing result"}
+            if result.get("error"):
+                errors.append(agent_name)
+                continue
+            state["agent_outputs"][agent_name] = result["content"]
+            state["completed_agents"].append(agent_name)
+        doc_dir = os.path.join(out_dir, doc_id)
+        os.makedirs(doc_dir, exist_ok=True)
+        with open(os.path.join(doc_dir, "state.json"), "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, default=str)
+        with open(os.path.join(doc_dir, "proposal.md"), "w", encoding="utf-8") as f:
+            f.write(system.generate_final_proposal(state))
+        summary.append({"document": doc_id, "path": documents[doc_id]["path"],
+                        "status": "ok" if not errors else f"missing: {', '.join(errors)}",
+                        "agents": len(state["completed_agents"])})
+
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-process RFP documents offline")
+    parser.add_argument("paths", nargs="+", help="PDF, DOCX or TXT files")
+    parser.add_argument("--out", default="bulk_output", help="directory for batch files and proposals")
+    parser.add_argument("--submitter", choices=["local", "azure"], default="azure")
+    parser.add_argument("--profile", default=None, help="company profile id")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL)
+    args = parser.parse_args()
+
+    if args.submitter == "local":
+        submitter = LocalSubmitter(local_responder())
+    else:
+        import app3
+
+        client = app3.AzureOpenAIConfig().get_client()
+        if client is None:
+            parser.error("Azure OpenAI is not configured (AZURE_OPENAI_API_KEY / AZURE_OPENAI_ENDPOINT)")
+        submitter = AzureBatchSubmitter(client, poll_interval=args.poll_interval)
+
+    for row in run_bulk(args.paths, args.out, submitter, args.profile):
+        print(f"{row['document']}: {row['status']}")
+
+
+def local_responder() -> Callable[[Dict], str]:
+    """Mock answers shaped like the real ones: parse -> JSON, agents -> the app's mock outputs"""
+    import app3
+
+    system = app3.SimpleLangGraphProposalSystem(app3.AzureOpenAIConfig())
+
+    def respond(line: Dict) -> str:
+        stage = line["custom_id"].rsplit(":", 1)[1]
+        if stage == "parse":
+            parsed_data = app3.mock_rfp_analysis(line["body"]["messages"][-1]["content"])
+            return json.dumps({key: value for key, value in parsed_data.items() if not key.startswith("_")})
+        return system._get_mock_output(stage)
+
+    return respond
+
+
+if __name__ == "__main__":
+    main()
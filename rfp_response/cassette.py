@@ -0,0 +1,147 @@
+"""Record/replay cassettes for deterministic offline runs of the whole pipeline.
+
+With ``RFP_CASSETTE_MODE=record`` every successful LLM attempt made by ``ModelRouter``
+(the parse ``chat_completion`` and the agents' ``invoke`` calls, continuations and
+sub-sections included) is appended to the cassette file ``RFP_CASSETTE_PATH`` as one
+JSON line: route, deployment, request messages, response and the attempt's duration.
+
+With ``RFP_CASSETTE_MODE=replay`` the same calls are answered from the cassette without
+any network access (Azure credentials are not needed; the app behaves as configured).
+Requests are matched on call kind, route and messages; repeated identical requests are
+served in recorded order. ``RFP_CASSETTE_LATENCY`` scales the recorded durations
+(``1`` reproduces them, ``0`` — the default — answers immediately), so end-to-end
+performance runs are reproducible. A request missing from the cassette raises
+``CassetteMiss``. Failed attempts are not recorded. While a cassette is active (either
+mode) the agents are not grounded with past-proposal retrieval and approved sections
+are not indexed, since that index changes between recording and replay.
+"""
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from langchain.schema import AIMessage
+from openai.types.chat import ChatCompletion
+
+from singleflight import fingerprint
+
+RECORD = "record"
+REPLAY = "replay"
+CASSETTE_MODE = os.getenv("RFP_CASSETTE_MODE", "").lower()
+CASSETTE_PATH = os.getenv("RFP_CASSETTE_PATH", "llm_cassette.jsonl")
+LATENCY_SCALE = float(os.getenv("RFP_CASSETTE_LATENCY", "0"))
+
+INVOKE = "invoke"
+CHAT = "chat"
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recorded response for a request"""
+
+
+def _dump_response(kind: str, response) -> Dict:
+    if kind == INVOKE:
+        return {"content": response.content, "response_metadata": dict(getattr(response, "response_metadata", {}) or {})}
+    return response.model_dump()
+
+
+def _load_response(kind: str, data: Dict):
+    if kind == INVOKE:
+        return AIMessage(content=data["content"], response_metadata=data.get("response_metadata") or {})
+    return ChatCompletion.model_validate(data)
+
+
+class Cassette:
+    """One cassette file in record or replay mode"""
+
+    def __init__(self, path: str, mode: str, latency_scale: float = LATENCY_SCALE):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict]] = {}
+        self._served: Dict[str, int] = {}
+        self.counters = {"recorded": 0, "replayed": 0, "misses": 0}
+        if mode == REPLAY:
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for raw in f:
+                if raw.strip():
+                    entry = json.loads(raw)
+                    self._entries.setdefault(entry["key"], []).append(entry)
+
+    @staticmethod
+    def request_key(kind: str, name: str, request) -> str:
+        return fingerprint(kind, name, request)
+
+    def wrap(self, kind: str, name: str, request, attempt: Callable) -> Callable:
+        """``attempt(route, deployment)`` recorded to, or answered from, the cassette"""
+        key = self.request_key(kind, name, request)
+
+        def recorded(route: Dict, deployment: str):
+            started = time.perf_counter()
+            response = attempt(route, deployment)
+            self._append({
+                "key": key, "kind": kind, "route": name, "deployment": deployment, "request": request,
+                "response": _dump_response(kind, response), "seconds": round(time.perf_counter() - started, 4),
+                "recorded_at": time.time(),
+            })
+            return response
+
+        def replayed(route: Dict, deployment: str):
+            entry = self._next(key)
+            if entry is None:
+                raise CassetteMiss(f"No recorded {kind} response for route {name} in {self.path}")
+            if self.latency_scale:
+                time.sleep(entry["seconds"] * self.latency_scale)
+            return _load_response(kind, entry["response"])
+
+        return recorded if self.mode == RECORD else replayed
+
+    def _append(self, entry: Dict):
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.counters["recorded"] += 1
+
+    def _next(self, key: str) -> Optional[Dict]:
+        """Recorded responses for ``key`` in order, repeating the last once exhausted"""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.counters["misses"] += 1
+                return None
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            self.counters["replayed"] += 1
+            return entries[min(index, len(entries) - 1)]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self.counters, mode=self.mode, path=self.path,
+                        requests=len(self._entries), responses=sum(len(e) for e in self._entries.values()))
+
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """Process-wide cassette when ``RFP_CASSETTE_MODE`` is set, else None"""
+    global _cassette
+    if CASSETTE_MODE not in (RECORD, REPLAY):
+        return None
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette(CASSETTE_PATH, CASSETTE_MODE)
+        return _cassette
+
+
+def replaying() -> bool:
+    return CASSETTE_MODE == REPLAY
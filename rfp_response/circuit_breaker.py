@@ -0,0 +1,125 @@
+"""Circuit breaker for the LLM path, with the cache used to degrade gracefully.
+
+When Azure OpenAI degrades, every call would otherwise hang for the full client timeout
+and then fail. ``CircuitBreaker`` counts consecutive failed calls (errors and timeouts;
+429s are left to the adaptive concurrency limiter) and opens after
+``RFP_BREAKER_FAILURES`` of them. While open, calls fail fast with
+``CircuitOpenError``. After ``RFP_BREAKER_RESET_SECONDS`` it goes half-open and lets
+one trial call through: success closes it, failure opens it again.
+
+Callers catch ``CircuitOpenError`` and serve the freshest output stored in the
+``FallbackCache`` for the same prompt inputs, or a clearly labeled placeholder.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from concurrency import is_throttled
+
+FAILURE_THRESHOLD = int(os.getenv("RFP_BREAKER_FAILURES", "5"))
+RESET_SECONDS = float(os.getenv("RFP_BREAKER_RESET_SECONDS", "30"))
+FALLBACK_CACHE_SIZE = 500
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the service while the breaker is open"""
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open trial call -> closed or open"""
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, reset_seconds: float = RESET_SECONDS):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.counters = {"opened": 0, "rejected": 0, "trials": 0}
+
+    def before_call(self):
+        """Admit a call or raise ``CircuitOpenError``"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                self.counters["trials"] += 1
+                return
+            self.counters["rejected"] += 1
+            raise CircuitOpenError(
+                f"Azure OpenAI is unavailable ({self.consecutive_failures} consecutive failures); "
+                f"retrying in {self.retry_in():.0f}s"
+            )
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, error: BaseException):
+        with self._lock:
+            if is_throttled(error):
+                # The service is up but busy; admitted half-open trials get another go
+                self._trial_in_flight = False
+                return
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.counters["opened"] += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def retry_in(self) -> float:
+        """Seconds until the next half-open trial (0 unless open)"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self.counters, state=self.state, consecutive_failures=self.consecutive_failures,
+                        retry_in=self.retry_in())
+
+
+class FallbackCache:
+    """Latest successful output per prompt-input key (bounded, least recently used dropped)"""
+
+    def __init__(self, size: int = FALLBACK_CACHE_SIZE):
+        self.size = size
+        self._entries: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Tuple[float, object]]:
+        """(stored at, value) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+
+_fallback_cache = FallbackCache()
+
+
+def get_fallback_cache() -> FallbackCache:
+    """Process-wide cache shared by every session"""
+    return _fallback_cache
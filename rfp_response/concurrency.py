@@ -0,0 +1,158 @@
+"""Adaptive (AIMD) limit on concurrent LLM calls across every session.
+
+A fixed parallelism setting is too timid off-peak and causes 429 storms when several
+teams share the Azure deployment. Every LLM attempt made by ``ModelRouter`` (parser,
+agents, sub-sections, speculative runs) takes a slot from one process-wide
+``AdaptiveLimiter``; callers beyond the current limit wait for a slot.
+
+The limit is adjusted once per window of completions (roughly one round trip at the
+current limit), like TCP congestion control:
+
+- additive increase: a healthy window in which the limit was actually reached raises
+  the limit by one;
+- multiplicative decrease: a 429 halves the limit at once (only once per burst; 429s from
+  calls started before the last decrease are ignored), and a window whose p95 latency
+  or error rate is too high cuts it by a quarter.
+
+Latency is judged relative to each route's own baseline (an average of healthy
+latencies), so the slow parse route and the short agent routes share one signal. Limits
+come from ``RFP_CONCURRENCY_MIN`` / ``_MAX`` / ``_INITIAL``; every change is recorded
+in ``history()`` for display.
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+MIN_LIMIT = int(os.getenv("RFP_CONCURRENCY_MIN", "1"))
+MAX_LIMIT = int(os.getenv("RFP_CONCURRENCY_MAX", "32"))
+INITIAL_LIMIT = int(os.getenv("RFP_CONCURRENCY_INITIAL", "4"))
+
+THROTTLE_DECREASE = 0.5
+OVERLOAD_DECREASE = 0.75
+LATENCY_TOLERANCE = 2.0   # window p95 / route baseline above this counts as overloaded
+ERROR_RATE_LIMIT = 0.2
+BASELINE_ALPHA = 0.1
+MIN_WINDOW = 4
+HISTORY_SIZE = 200
+
+
+def is_throttled(error: BaseException) -> bool:
+    """Whether an exception is an HTTP 429 from the service (openai or langchain wrapped)"""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or type(error).__name__ == "RateLimitError"
+
+
+class AdaptiveLimiter:
+    """Counting semaphore whose size follows observed latency, errors and throttling"""
+
+    def __init__(self, initial: int = INITIAL_LIMIT, minimum: int = MIN_LIMIT, maximum: int = MAX_LIMIT):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.in_flight = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+        self._baselines: Dict[str, float] = {}
+        self._window: List[Dict] = []
+        self._window_saturated = False
+        self._last_decrease = 0.0
+        self._history = deque(maxlen=HISTORY_SIZE)
+        self.counters = {"calls": 0, "throttled": 0, "errors": 0, "increases": 0, "decreases": 0, "wait_seconds": 0.0}
+        self._log("initial")
+
+    @contextmanager
+    def slot(self, route: str):
+        """Hold one concurrency slot for an LLM attempt on ``route``"""
+        started_wait = time.monotonic()
+        with self._condition:
+            self.waiting += 1
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.waiting -= 1
+            self.in_flight += 1
+            if self.in_flight >= self.limit:
+                self._window_saturated = True
+            self.counters["wait_seconds"] += time.monotonic() - started_wait
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self._release(route, started, time.monotonic() - started, error=e)
+            raise
+        self._release(route, started, time.monotonic() - started)
+
+    def _release(self, route: str, started: float, seconds: float, error: Optional[BaseException] = None):
+        with self._condition:
+            self.in_flight -= 1
+            self.counters["calls"] += 1
+            if error is not None and is_throttled(error):
+                self.counters["throttled"] += 1
+                # One decrease per burst: calls already in flight at the last cut don't count again
+                if started >= self._last_decrease:
+                    self._decrease(THROTTLE_DECREASE, "429 throttled")
+            else:
+                if error is not None:
+                    self.counters["errors"] += 1
+                self._observe(route, seconds, error is not None)
+            self._condition.notify_all()
+
+    def _observe(self, route: str, seconds: float, error: bool):
+        baseline = self._baselines.get(route)
+        self._window.append({"ratio": seconds / baseline if baseline and not error else None, "error": error})
+        if not error:
+            self._baselines[route] = seconds if baseline is None else baseline + BASELINE_ALPHA * (seconds - baseline)
+        if len(self._window) < max(self.limit, MIN_WINDOW):
+            return
+
+        ratios = sorted(sample["ratio"] for sample in self._window if sample["ratio"] is not None)
+        p95 = ratios[max(int(len(ratios) * 0.95) - 1, 0)] if ratios else None
+        error_rate = sum(sample["error"] for sample in self._window) / len(self._window)
+        if error_rate > ERROR_RATE_LIMIT:
+            self._decrease(OVERLOAD_DECREASE, f"error rate {error_rate:.0%}")
+        elif p95 is not None and p95 > LATENCY_TOLERANCE:
+            self._decrease(OVERLOAD_DECREASE, f"p95 latency {p95:.1f}x baseline")
+        elif self._window_saturated and self.limit < self.maximum:
+            self.limit += 1
+            self.counters["increases"] += 1
+            self._log("healthy window at limit")
+        self._window = []
+        self._window_saturated = self.in_flight >= self.limit
+
+    def _decrease(self, factor: float, reason: str):
+        new_limit = max(self.minimum, int(self.limit * factor))
+        self._last_decrease = time.monotonic()
+        self._window = []
+        self._window_saturated = False
+        if new_limit != self.limit:
+            self.limit = new_limit
+            self.counters["decreases"] += 1
+            self._log(reason)
+
+    def _log(self, reason: str):
+        self._history.append({"time": time.time(), "limit": self.limit, "reason": reason})
+
+    def history(self) -> List[Dict]:
+        """Every limit change, oldest first"""
+        with self._condition:
+            return list(self._history)
+
+    def stats(self) -> Dict:
+        with self._condition:
+            return dict(self.counters, limit=self.limit, in_flight=self.in_flight, waiting=self.waiting,
+                        minimum=self.minimum, maximum=self.maximum)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_concurrency_limiter() -> AdaptiveLimiter:
+    """Process-wide limiter shared by every session (they share the deployment's quota)"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveLimiter()
+        return _limiter
@@ -0,0 +1,188 @@
+"""Near-duplicate consolidation for the parser's requirement lists.
+
+Each item is reduced to its set of stemmed content words, summarised by a MinHash
+signature (NumPy, one vectorized pass per item) and bucketed with LSH banding, so only
+items that share a band are compared. Each item is checked against at most
+``MAX_BUCKET_CANDIDATES`` groups per bucket, so templated lists (every item sharing the
+same boilerplate words) stay linear instead of comparing all pairs in a huge bucket.
+
+Consolidation deletes items from the lists every agent and the coverage check read,
+so candidates are merged (union-find) only when they say the same thing: after pairing
+abbreviations with their long form ("app" / "application"), the words left over on
+either side must all be generic modifiers (``GENERIC_WORDS``: "platform", "system",
+"support", ...). "Mobile app for iOS and Android" and "Mobile application for iOS and
+Android platforms" are merged; "Integration with existing lab systems" and
+"Integration with existing pharmacy management systems", or "Staff portal" and
+"Patient portal", each have content words of their own and stay separate, as do
+items whose numbers differ. The most specific phrasing is kept as the canonical item.
+
+Run ``python dedupe.py`` for example merges and timings.
+"""
+import time
+import zlib
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from text_utils import estimate_tokens, stem, tokenize
+
+CONSOLIDATED_FIELDS = ["technical_requirements", "functional_requirements", "risk_factors", "identified_components"]
+MIN_PREFIX_CHARS = 3  # "app" pairs with "application", "integrate" with "integration"
+NUM_PERMUTATIONS = 64
+BANDS = 32  # 32 bands x 2 rows: pairs from ~0.3 Jaccard up become candidates
+MAX_BUCKET_CANDIDATES = 8
+PROMPT_AGENTS = 6  # every agent prompt embeds the parsed RFP
+
+# Modifiers that restatements add or drop without changing what is required
+GENERIC_WORDS = frozenset(stem(word) for word in """
+platform platforms system systems solution solutions application applications support supports
+capability capabilities functionality feature features service services based new modern
+robust comprehensive full complete overall various relevant appropriate existing provide provided
+ability able enable enabled using use such including etc
+""".split())
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = np.random.default_rng(20240601)
+_PERM_A = _rng.integers(1, _MERSENNE_PRIME, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _MERSENNE_PRIME, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(text: str) -> frozenset:
+    """Stemmed content words of an item (list items are short, so words beat n-grams)"""
+    return frozenset(stem(token) for token in tokenize(text))
+
+
+def minhash(features: frozenset) -> np.ndarray:
+    """MinHash signature of a feature set"""
+    if not features:
+        return np.full(NUM_PERMUTATIONS, _MERSENNE_PRIME, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint64)
+    # (a * x + b) mod p for every permutation at once; x < 2^32 and a < 2^61 can overflow
+    # uint64, which only reshuffles the (still deterministic) permutation
+    permuted = (hashes[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) % _MERSENNE_PRIME
+    return permuted.min(axis=0)
+
+
+def _find(parents: List[int], i: int) -> int:
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def _abbreviates(a: str, b: str) -> bool:
+    if not (a.isalpha() and b.isalpha()):  # "100" does not abbreviate "1000"
+        return False
+    return min(len(a), len(b)) >= MIN_PREFIX_CHARS and (a.startswith(b) or b.startswith(a))
+
+
+def is_restatement(a: frozenset, b: frozenset) -> bool:
+    """Whether two word sets say the same thing (only generic modifiers differ)"""
+    if not a & b:
+        return False
+    only_a, only_b = set(a - b), set(b - a)
+    for word in list(only_a):
+        partner = next((other for other in only_b if _abbreviates(word, other)), None)
+        if partner is not None:
+            only_a.discard(word)
+            only_b.discard(partner)
+    return only_a <= GENERIC_WORDS and only_b <= GENERIC_WORDS
+
+
+def cluster_near_duplicates(items: List[str]) -> List[List[int]]:
+    """Groups of item indexes that restate each other, in order of first appearance"""
+    features = [shingles(str(item)) for item in items]
+    signatures = [minhash(f) for f in features]
+    rows = NUM_PERMUTATIONS // BANDS
+
+    buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+    for i, signature in enumerate(signatures):
+        if not features[i]:
+            continue
+        for band in range(BANDS):
+            buckets[(band, signature[band * rows:(band + 1) * rows].tobytes())].append(i)
+
+    parents = list(range(len(items)))
+    checked = set()  # at most MAX_BUCKET_CANDIDATES pairs per item and band
+    for members in buckets.values():
+        # One representative per group formed in the bucket, and only the most recent
+        # few groups: exact-duplicate buckets collapse to one group, templated ones are capped
+        representatives: Dict[int, int] = {}
+        for j in members:
+            for i in list(islice(reversed(representatives.values()), MAX_BUCKET_CANDIDATES)):
+                if (i, j) in checked or _find(parents, j) == _find(parents, i):
+                    continue
+                checked.add((i, j))
+                if is_restatement(features[i], features[j]):
+                    parents[_find(parents, j)] = _find(parents, i)
+            root = _find(parents, j)
+            representatives.pop(root, None)
+            representatives[root] = j
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(items)):
+        groups.setdefault(_find(parents, i), []).append(i)
+    return sorted(groups.values(), key=lambda group: group[0])
+
+
+def consolidate_list(items: List) -> Tuple[List, List[Dict]]:
+    """Deduplicated list (canonical phrasing per group) and the merges that were made"""
+    consolidated, merges = [], []
+    for group in cluster_near_duplicates(items):
+        # The most specific phrasing (most distinct content words, then longest) wins
+        canonical = max(group, key=lambda i: (len(shingles(str(items[i]))), len(str(items[i])), -i))
+        consolidated.append(items[canonical])
+        if len(group) > 1:
+            merges.append({"canonical": items[canonical], "merged": [items[i] for i in group if i != canonical]})
+    return consolidated, merges
+
+
+def consolidate_parsed_data(parsed_data: Dict, fields: List[str] = CONSOLIDATED_FIELDS) -> Dict:
+    """Merge near-duplicate items in ``fields`` in place and return a report of what changed"""
+    report = {"fields": {}, "items_before": 0, "items_after": 0, "prompt_tokens_saved": 0}
+    for field in fields:
+        items = parsed_data.get(field)
+        if not isinstance(items, list) or len(items) < 2:
+            continue
+        consolidated, merges = consolidate_list(items)
+        report["items_before"] += len(items)
+        report["items_after"] += len(consolidated)
+        if merges:
+            saved = estimate_tokens(str(items)) - estimate_tokens(str(consolidated))
+            report["prompt_tokens_saved"] += saved * PROMPT_AGENTS
+            report["fields"][field] = merges
+            parsed_data[field] = consolidated
+    return report
+
+
+EXAMPLES = [
+    ("Mobile app for iOS and Android", "Mobile application for iOS and Android platforms"),
+    ("Payment gateway integration (Stripe, PayPal)", "Integrate payment gateways such as Stripe and PayPal"),
+    ("Role-based access control", "Role-based access control for admin users"),
+    ("Phase 1 deliverables and acceptance", "Phase 2 deliverables and acceptance"),
+    ("Web app for customers", "Mobile app for field staff"),
+    ("Integration with existing lab systems", "Integration with existing pharmacy management systems"),
+    ("Staff portal for appointment scheduling", "Patient portal for appointment scheduling"),
+]
+
+
+def benchmark(sizes: Tuple[int, ...] = (1500, 3000, 6000, 24000)) -> List[Dict]:
+    """Clustering time on templated lists (every item shares the same boilerplate words)"""
+    results = []
+    for size in sizes:
+        items = [f"The system shall support requirement number {i} for module {i % 37} and report {i % 11}"
+                 for i in range(size)]
+        started = time.perf_counter()
+        groups = cluster_near_duplicates(items)
+        results.append({"items": size, "groups": len(groups), "seconds": round(time.perf_counter() - started, 2)})
+    return results
+
+
+if __name__ == "__main__":
+    for a, b in EXAMPLES:
+        merged = len(cluster_near_duplicates([a, b])) == 1
+        print(f"{'merged  ' if merged else 'separate'}  {a!r} / {b!r}")
+    for row in benchmark():
+        print(row)
@@ -0,0 +1,309 @@
+"""On-demand proposal exports (TXT, Markdown, DOCX, PDF and feedback CSV).
+
+Artifacts are rendered only when requested, on a background worker, and cached in
+the blob store keyed by a hash of the proposal document and the feedback history,
+so reruns of the consolidate page never re-encode anything.
+"""
+import hashlib
+import io
+import json
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import docx
+import pandas as pd
+
+from session_store import get_blob_store
+
+# format -> (button label, file extension, mime type)
+EXPORT_FORMATS = {
+    "txt": ("📄 Download as Text File", "txt", "text/plain"),
+    "md": ("📝 Download as Markdown", "md", "text/markdown"),
+    "docx": ("📘 Download as Word (DOCX)", "docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "pdf": ("📕 Download as PDF", "pdf", "application/pdf"),
+    "feedback_csv": ("📊 Download Feedback History (CSV)", "csv", "text/csv"),
+}
+MAX_CACHED_ARTIFACTS = 64
+
+
+def export_key(document_digest: str, feedback_history: List[Dict]) -> str:
+    """Cache key for every artifact built from one document + feedback history"""
+    feedback_json = json.dumps(feedback_history, sort_keys=True, default=str)
+    return hashlib.sha256(f"{document_digest}:{feedback_json}".encode("utf-8")).hexdigest()
+
+
+# Markdown helpers shared by the renderers
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+_BULLET_RE = re.compile(r"^\s*[-*•]\s+(.*)$")
+_NUMBERED_RE = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+_RULE_RE = re.compile(r"^\s*(-{3,}|\*{3,}|_{3,})\s*$")
+
+
+def _strip_inline_markdown(text: str) -> str:
+    text = re.sub(r"\*\*(.+?)\*\*", r"\1", text)
+    text = re.sub(r"(?<!\w)\*(?!\s)(.+?)(?<!\s)\*(?!\w)", r"\1", text)
+    return text.replace("`", "")
+
+
+def render_text(document: str) -> bytes:
+    """Plain text with Markdown syntax removed"""
+    lines = []
+    for line in document.splitlines():
+        heading = _HEADING_RE.match(line.strip())
+        if heading:
+            title = _strip_inline_markdown(heading.group(2))
+            lines.append(title.upper() if len(heading.group(1)) == 1 else title)
+        elif _RULE_RE.match(line):
+            lines.append("-" * 60)
+        else:
+            lines.append(_strip_inline_markdown(line))
+    return "\n".join(lines).encode("utf-8")
+
+
+def render_markdown(document: str) -> bytes:
+    return document.encode("utf-8")
+
+
+def _add_runs(paragraph, text: str):
+    """Add text to a DOCX paragraph, turning **bold** spans into bold runs"""
+    for i, part in enumerate(text.split("**")):
+        if part:
+            run = paragraph.add_run(part)
+            run.bold = i % 2 == 1
+
+
+def render_docx(document: str) -> bytes:
+    """Word document with headings, bullet/numbered lists and Markdown tables"""
+    doc = docx.Document()
+    table_rows: List[List[str]] = []
+
+    def flush_table():
+        rows = [row for row in table_rows if not all(re.fullmatch(r":?-{2,}:?", cell) for cell in row)]
+        table_rows.clear()
+        if not rows:
+            return
+        width = max(len(row) for row in rows)
+        table = doc.add_table(rows=len(rows), cols=width)
+        table.style = "Table Grid"
+        for r, row in enumerate(rows):
+            for c, cell in enumerate(row):
+                table.cell(r, c).text = _strip_inline_markdown(cell)
+
+    for raw_line in document.splitlines():
+        line = raw_line.strip()
+        if line.startswith("|") and line.endswith("|") and len(line) > 1:
+            table_rows.append([cell.strip() for cell in line.strip("|").split("|")])
+            continue
+        flush_table()
+
+        if not line:
+            continue
+        heading = _HEADING_RE.match(line)
+        if heading:
+            doc.add_heading(_strip_inline_markdown(heading.group(2)), level=min(len(heading.group(1)) - 1, 4))
+        elif _RULE_RE.match(line):
+            continue
+        elif _BULLET_RE.match(line):
+            _add_runs(doc.add_paragraph(style="List Bullet"), _BULLET_RE.match(line).group(1))
+        elif _NUMBERED_RE.match(line):
+            _add_runs(doc.add_paragraph(style="List Number"), _NUMBERED_RE.match(line).group(1))
+        else:
+            _add_runs(doc.add_paragraph(), line)
+    flush_table()
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_escape(text: str) -> bytes:
+    data = text.encode("cp1252", "ignore")
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _wrap(text: str, max_chars: int) -> List[str]:
+    words, lines, current = text.split(), [], ""
+    for word in words:
+        while len(word) > max_chars:
+            if current:
+                lines.append(current)
+                current = ""
+            lines.append(word[:max_chars])
+            word = word[max_chars:]
+        if current and len(current) + 1 + len(word) > max_chars:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines or [""]
+
+
+def render_pdf(document: str) -> bytes:
+    """Dependency-free PDF (Helvetica, US Letter) with headings, lists and page breaks"""
+    page_width, page_height, margin = 612, 792, 54
+    usable_width = page_width - 2 * margin
+
+    # (font, size, indent, text) per output line
+    layout: List[Tuple[str, float, float, str]] = []
+    for raw_line in document.splitlines():
+        line = raw_line.strip()
+        if not line:
+            layout.append(("F1", 10.5, 0, ""))
+            continue
+        if _RULE_RE.match(line):
+            continue
+        heading = _HEADING_RE.match(line)
+        if heading:
+            size = {1: 18, 2: 14, 3: 12}.get(len(heading.group(1)), 11)
+            font, indent, text = "F2", 0, _strip_inline_markdown(heading.group(2))
+        elif _BULLET_RE.match(line):
+            size, font, indent = 10.5, "F1", 12
+            text = "• " + _strip_inline_markdown(_BULLET_RE.match(line).group(1))
+        else:
+            size, font, indent, text = 10.5, "F1", 0, _strip_inline_markdown(line)
+        # Helvetica averages roughly half an em per character
+        max_chars = max(int((usable_width - indent) / (size * 0.5)), 10)
+        for wrapped in _wrap(text, max_chars):
+            layout.append((font, size, indent, wrapped))
+
+    pages: List[bytes] = []
+    stream, y = [], page_height - margin
+    for font, size, indent, text in layout:
+        leading = size * 1.35
+        if y - leading < margin:
+            pages.append(b"\n".join(stream))
+            stream, y = [], page_height - margin
+        y -= leading
+        if text:
+            stream.append(
+                b"BT /" + font.encode() + b" " + f"{size:g}".encode() + b" Tf "
+                + f"{margin + indent:g} {y:.2f}".encode() + b" Td (" + _pdf_escape(text) + b") Tj ET"
+            )
+    pages.append(b"\n".join(stream))
+
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # pages tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for content in pages:
+        objects.append(b"<< /Length " + str(len(content)).encode() + b" >>\nstream\n" + content + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 " + f"{page_width} {page_height}".encode()
+            + b"] /Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents "
+            + str(content_id).encode() + b" 0 R >>"
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(str(page_id).encode() + b" 0 R" for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count " + str(len(page_ids)).encode() + b" >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(str(number).encode() + b" 0 obj\n" + body + b"\nendobj\n")
+    xref_offset = out.tell()
+    out.write(b"xref\n0 " + str(len(objects) + 1).encode() + b"\n0000000000 65535 f \n")
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(b"trailer\n<< /Size " + str(len(objects) + 1).encode() + b" /Root 1 0 R >>\nstartxref\n"
+              + str(xref_offset).encode() + b"\n%%EOF\n")
+    return out.getvalue()
+
+
+def render_feedback_csv(feedback_history: List[Dict]) -> bytes:
+    return pd.DataFrame(feedback_history).to_csv(index=False).encode("utf-8")
+
+
+class ExportManager:
+    """Renders export artifacts on a background worker and caches them by content hash"""
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="proposal-export")
+        self._artifacts: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._pending: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, fmt: str) -> Optional[bytes]:
+        """Cached artifact bytes, or None if it hasn't been rendered yet"""
+        with self._lock:
+            digest = self._artifacts.get((key, fmt))
+            if digest is not None:
+                self._artifacts.move_to_end((key, fmt))
+        return get_blob_store().get(digest) if digest else None
+
+    def is_pending(self, key: str, fmt: str) -> bool:
+        with self._lock:
+            future = self._pending.get((key, fmt))
+        return future is not None and not future.done()
+
+    def has_pending(self, key: str) -> bool:
+        with self._lock:
+            return any(k == key and not future.done() for (k, _), future in self._pending.items())
+
+    def error(self, key: str, fmt: str) -> Optional[str]:
+        with self._lock:
+            future = self._pending.get((key, fmt))
+        if future is not None and future.done() and future.exception():
+            return str(future.exception())
+        return None
+
+    def request(self, key: str, fmt: str, document: str, feedback_history: List[Dict]) -> Future:
+        """Start rendering an artifact (no-op if it is cached or already being rendered)"""
+        with self._lock:
+            future = self._pending.get((key, fmt))
+            if (key, fmt) in self._artifacts or (future is not None and not future.done()):
+                return future
+            future = self._executor.submit(self._render, key, fmt, document, list(feedback_history))
+            self._pending[(key, fmt)] = future
+            return future
+
+    def render_now(self, key: str, fmt: str, document: str, feedback_history: List[Dict]) -> bytes:
+        """Render synchronously (for cheap formats) through the same cache"""
+        cached = self.get(key, fmt)
+        if cached is not None:
+            return cached
+        return self._render(key, fmt, document, feedback_history)
+
+    def _render(self, key: str, fmt: str, document: str, feedback_history: List[Dict]) -> bytes:
+        renderers = {
+            "txt": lambda: render_text(document),
+            "md": lambda: render_markdown(document),
+            "docx": lambda: render_docx(document),
+            "pdf": lambda: render_pdf(document),
+            "feedback_csv": lambda: render_feedback_csv(feedback_history),
+        }
+        data = renderers[fmt]()
+        blobs = get_blob_store()
+        digest = blobs.put(data, incref=True)
+        with self._lock:
+            if (key, fmt) not in self._artifacts:
+                self._artifacts[(key, fmt)] = digest
+            else:
+                blobs.decref(digest)  # rendered twice; the cached copy already holds a reference
+            while len(self._artifacts) > MAX_CACHED_ARTIFACTS:
+                _, old_digest = self._artifacts.popitem(last=False)
+                blobs.decref(old_digest)
+            self._pending.pop((key, fmt), None)
+        return data
+
+
+_export_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_export_manager() -> ExportManager:
+    global _export_manager
+    with _manager_lock:
+        if _export_manager is None:
+            _export_manager = ExportManager()
+        return _export_manager
@@ -0,0 +1,246 @@
+"""Streaming text extraction for uploaded RFP documents.
+
+DOCX files are read straight from ``word/document.xml`` with an incremental XML parser
+instead of building the python-docx object model. Paragraphs and tables are emitted in
+document order (table rows as ``|``-delimited lines, so pricing schedules and
+requirement matrices survive), and page headers/footers are emitted once each.
+
+Extraction can also run on a background worker (``start_extraction``) as soon as a
+file is uploaded, so the parsing step only has to wait for whatever is left of it. Concurrent extractions
+of the same file (same fingerprint) share one run.
+
+Run ``python extraction.py [file.docx]`` to compare against python-docx.
+"""
+import hashlib
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List
+from xml.etree.ElementTree import iterparse
+
+from singleflight import get_singleflight
+
+PDF_TYPE = "application/pdf"
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TXT_TYPE = "text/plain"
+EXTRACTION_WORKERS = int(os.getenv("RFP_EXTRACTION_WORKERS", "2"))
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_PARAGRAPH = W_NS + "p"
+_TEXT = W_NS + "t"
+_TAB = W_NS + "tab"
+_BREAKS = (W_NS + "br", W_NS + "cr")
+_TABLE = W_NS + "tbl"
+_ROW = W_NS + "tr"
+_CELL = W_NS + "tc"
+_BODY = W_NS + "body"
+_HEADER_FOOTER_RE = re.compile(r"^word/(header|footer)\d*\.xml$")
+
+
+def _iter_blocks(xml_file) -> Iterator[str]:
+    """Paragraph lines and table rows from a WordprocessingML part, in document order"""
+    paragraph: List[str] = []
+    tables: List[List[List[str]]] = []  # stack of tables (rows of cell texts) for nested tables
+    cells: List[List[str]] = []         # stack of paragraphs collected for the open cell(s)
+    container = None                    # body (or header/footer root) whose finished blocks we drop
+
+    for event, elem in iterparse(xml_file, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if container is None:
+                if tag == _BODY or tag in (W_NS + "hdr", W_NS + "ftr"):
+                    container = elem
+            elif tag == _PARAGRAPH:
+                paragraph = []
+            elif tag == _TABLE:
+                tables.append([])
+            elif tag == _ROW:
+                tables[-1].append([])
+            elif tag == _CELL:
+                cells.append([])
+            continue
+
+        if tag == _TEXT:
+            paragraph.append(elem.text or "")
+        elif tag == _TAB:
+            paragraph.append("\t")
+        elif tag in _BREAKS:
+            paragraph.append("\n")
+        elif tag == _PARAGRAPH:
+            text = "".join(paragraph).strip()
+            if cells:
+                if text:
+                    cells[-1].append(text)
+            else:
+                yield text
+                container.clear()  # keep the parsed tree from growing with the document
+            elem.clear()
+        elif tag == _CELL:
+            cell_text = " ".join(cells.pop()).replace("|", "/")
+            if tables and tables[-1]:
+                tables[-1][-1].append(cell_text)
+        elif tag == _TABLE:
+            rows = [row for row in tables.pop() if any(row)]
+            if tables and cells:
+                # Nested table: fold its rows into the enclosing cell
+                cells[-1].append("; ".join(", ".join(cell for cell in row if cell) for row in rows))
+            else:
+                yield ""
+                for row in rows:
+                    yield "| " + " | ".join(row) + " |"
+                yield ""
+                container.clear()
+            elem.clear()
+
+
+def extract_docx_text(data: bytes) -> str:
+    """Text of a DOCX document: headers, body paragraphs and tables, then footers"""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        names = archive.namelist()
+        header_lines, footer_lines, seen = [], [], set()
+        for name in sorted(n for n in names if _HEADER_FOOTER_RE.match(n)):
+            with archive.open(name) as part:
+                text = "\n".join(line for line in _iter_blocks(part) if line).strip()
+            # The same header is often repeated across sections (first page, even/odd pages)
+            if text and text not in seen:
+                seen.add(text)
+                (header_lines if "header" in name else footer_lines).append(text)
+
+        with archive.open("word/document.xml") as part:
+            body = "\n".join(_iter_blocks(part))
+
+    body = re.sub(r"\n{3,}", "\n\n", body).strip()
+    return "\n\n".join(part for part in ["\n".join(header_lines), body, "\n".join(footer_lines)] if part) + "\n"
+
+
+def extract_pdf_text(data: bytes) -> str:
+    """Text of a PDF, pages separated by form feeds so repeated headers/footers can be detected"""
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return "\f".join(page.extract_text() or "" for page in reader.pages) + "\n"
+
+
+def extract_text(data: bytes, file_type: str) -> str:
+    """Text of an uploaded document by MIME type (raises ``ValueError`` for unsupported types)"""
+    if file_type == PDF_TYPE:
+        return extract_pdf_text(data)
+    if file_type == DOCX_TYPE:
+        return extract_docx_text(data)
+    if file_type == TXT_TYPE:
+        return data.decode("utf-8")
+    raise ValueError(f"Unsupported file type: {file_type}")
+
+
+_executor = ThreadPoolExecutor(max_workers=EXTRACTION_WORKERS, thread_name_prefix="rfp-extraction")
+
+
+def _extraction_job(data: bytes, file_type: str) -> Dict:
+    started = time.perf_counter()
+    fingerprint = hashlib.sha256(data).hexdigest()
+    text = get_singleflight("extraction").do(f"{fingerprint}:{file_type}", lambda: extract_text(data, file_type))
+    return {"text": text, "fingerprint": fingerprint, "seconds": time.perf_counter() - started}
+
+
+def start_extraction(data: bytes, file_type: str) -> Future:
+    """Fingerprint and extract a document on a background worker.
+
+    The future resolves to ``{"text", "fingerprint", "seconds"}`` or raises the extraction error.
+    """
+    return _executor.submit(_extraction_job, data, file_type)
+
+
+def _python_docx_text(data: bytes) -> str:
+    """The previous extraction path (python-docx object model, paragraphs only)"""
+    import docx
+
+    doc = docx.Document(io.BytesIO(data))
+    return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
+
+
+def _synthetic_docx(paragraphs: int = 20000, tables: int = 200) -> bytes:
+    import docx
+
+    doc = docx.Document()
+    doc.sections[0].header.paragraphs[0].text = "City of Example - RFP 2024-117 - Confidential"
+    doc.sections[0].footer.paragraphs[0].text = "Page footer - Procurement Office"
+    per_table = max(paragraphs // max(tables, 1), 1)
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Requirement {i}: The vendor shall provide secure, scalable services "
+                          f"with documented SLAs and 24/7 support for component {i % 97}.")
+        if tables and i % per_table == 0:
+            table = doc.add_table(rows=6, cols=4)
+            for r in range(6):
+                for c in range(4):
+                    table.cell(r, c).text = f"R{r}C{c} ${(r + 1) * (c + 1) * 1000:,}"
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def _peak_rss_kb() -> int:
+    """High-water resident memory of this process (VmHWM is reset on exec, unlike ru_maxrss)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _measure(name: str, path: str) -> dict:
+    """Run one extractor on a file and report its time and peak RSS (run in a fresh process)"""
+    with open(path, "rb") as f:
+        data = f.read()
+    extractor = {"python-docx": _python_docx_text, "streaming": extract_docx_text}[name]
+    baseline = _peak_rss_kb()
+    started = time.perf_counter()
+    text = extractor(data)
+    seconds = time.perf_counter() - started
+    return {
+        "extractor": name,
+        "seconds": round(seconds, 3),
+        "peak_rss_mb": round((_peak_rss_kb() - baseline) / 1024, 1),
+        "chars": len(text),
+        "table_rows": text.count("\n| "),
+    }
+
+
+def benchmark(data: bytes) -> List[dict]:
+    """Time and peak memory of both DOCX extraction paths, each in its own process"""
+    with tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as f:
+        f.write(data)
+    try:
+        return [
+            json.loads(subprocess.run(
+                [sys.executable, __file__, "--measure", name, f.name],
+                check=True, capture_output=True, text=True
+            ).stdout)
+            for name in ("python-docx", "streaming")
+        ]
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--measure":
+        print(json.dumps(_measure(sys.argv[2], sys.argv[3])))
+        sys.exit(0)
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            sample = f.read()
+    else:
+        sample = _synthetic_docx()
+    print(f"{len(sample) / 1e6:.1f} MB DOCX")
+    for row in benchmark(sample):
+        print(row)
@@ -0,0 +1,151 @@
+"""Compact RFP fact sheet shared by the downstream agents.
+
+Estimation, Timeline and Sales/Marketing each used to receive the whole parsed RFP and
+re-derive scope size, budget and duration from it, with inconsistent numbers. The
+orchestrator stage now condenses the parsed data into one small, schema-checked sheet
+(components, sizing, budget band, duration, key dates, key risks) that those agents get
+instead. It is a pure function of the parsed data, so prompts built from it stay
+reproducible for speculative runs and the warm cache.
+"""
+import json
+from typing import Dict, List
+
+from text_utils import estimate_tokens
+
+FACT_SHEET_AGENTS = ["Estimation Agent", "Timeline Agent", "Sales/Marketing Agent"]
+
+MAX_COMPONENTS = 8
+MAX_RISKS = 5
+MAX_ITEM_CHARS = 120
+
+_OPTIONAL_NUMBER = (int, float, type(None))
+_OPTIONAL_STRING = (str, type(None))
+FACT_SHEET_SCHEMA = {
+    "title": str,
+    "project_type": str,
+    "components": list,
+    "sizing": {"requirements": int, "deliverables": int, "components": int, "scope": str},
+    "budget_band": {"label": str, "min": _OPTIONAL_NUMBER, "max": _OPTIONAL_NUMBER, "currency": _OPTIONAL_STRING},
+    "duration": {"label": str, "min_months": _OPTIONAL_NUMBER, "max_months": _OPTIONAL_NUMBER},
+    "key_dates": dict,
+    "key_risks": list,
+}
+
+
+def _text(value) -> str:
+    return str(value).strip()[:MAX_ITEM_CHARS] if value else ""
+
+
+def _items(values, limit: int) -> List[str]:
+    if not isinstance(values, list):
+        return []
+    return [_text(value) for value in values if value][:limit]
+
+
+def _section(rfp_data: Dict, field: str, text_key: str) -> Dict:
+    """A parsed section as a dict; a bare value (e.g. ``"budget_information": "$1M"``) becomes ``text_key``"""
+    value = rfp_data.get(field)
+    if isinstance(value, dict):
+        return value
+    return {text_key: value} if isinstance(value, (str, int, float)) and not isinstance(value, bool) else {}
+
+
+def _count(values) -> int:
+    return len(values) if isinstance(values, list) else 0
+
+
+def _typed(rfp_data: Dict, path: str) -> Dict:
+    """Typed value from the rule-based fast path (e.g. budget min/max), if its value is the one kept"""
+    field = (rfp_data.get("_fast_path") or {}).get("fields", {}).get(path) or {}
+    section, name = path.split(".", 1)
+    kept = rfp_data.get(section)
+    if not isinstance(kept, dict) or kept.get(name) != field.get("value"):
+        return {}  # a low-confidence rule value the LLM parse replaced
+    return field.get("typed") or {}
+
+
+def _scope(requirements: int, deliverables: int) -> str:
+    size = requirements + deliverables
+    return "Small" if size < 10 else "Medium" if size < 25 else "Large"
+
+
+def build_fact_sheet(rfp_data: Dict) -> Dict:
+    """Fact sheet for the downstream agents, validated against ``FACT_SHEET_SCHEMA``"""
+    overview = _section(rfp_data, "project_overview", "title")
+    budget = _section(rfp_data, "budget_information", "budget_range")
+    timeline = _section(rfp_data, "timeline_constraints", "project_duration")
+    contact = _section(rfp_data, "contact_information", "submission_deadline")
+    requirements = sum(_count(rfp_data.get(field)) for field in
+                       ("technical_requirements", "functional_requirements", "compliance_requirements"))
+    deliverables = _count(rfp_data.get("deliverables"))
+    components = _items(rfp_data.get("identified_components"), MAX_COMPONENTS)
+    budget_typed = _typed(rfp_data, "budget_information.budget_range")
+    duration_typed = _typed(rfp_data, "timeline_constraints.project_duration")
+
+    sheet = {
+        "title": _text(overview.get("title")),
+        "project_type": _text(overview.get("type")),
+        "components": components,
+        "sizing": {
+            "requirements": requirements,
+            "deliverables": deliverables,
+            "components": _count(rfp_data.get("identified_components")),
+            "scope": _scope(requirements, deliverables),
+        },
+        "budget_band": {
+            "label": _text(budget.get("budget_range")) or "Not specified",
+            "min": budget_typed.get("min"),
+            "max": budget_typed.get("max"),
+            "currency": budget_typed.get("currency"),
+        },
+        "duration": {
+            "label": _text(timeline.get("project_duration")) or "Not specified",
+            "min_months": duration_typed.get("min_months"),
+            "max_months": duration_typed.get("max_months"),
+        },
+        "key_dates": {
+            name: _text(value) for name, value in (
+                ("start", timeline.get("start_date")),
+                ("delivery", timeline.get("delivery_date")),
+                ("submission_deadline", contact.get("submission_deadline")),
+            ) if value
+        },
+        "key_risks": _items(rfp_data.get("risk_factors"), MAX_RISKS),
+    }
+    return validate_fact_sheet(sheet)
+
+
+def validate_fact_sheet(sheet: Dict) -> Dict:
+    """Check a fact sheet's fields and types (raises ``ValueError``)"""
+    def check(value, schema, path):
+        if isinstance(schema, dict):
+            if not isinstance(value, dict):
+                raise ValueError(f"Fact sheet field {path} must be an object")
+            missing = set(schema) - set(value)
+            if missing:
+                raise ValueError(f"Fact sheet field {path} is missing {', '.join(sorted(missing))}")
+            for key, sub_schema in schema.items():
+                check(value[key], sub_schema, f"{path}.{key}")
+        elif not isinstance(value, schema) or isinstance(value, bool):
+            raise ValueError(f"Fact sheet field {path} has type {type(value).__name__}")
+
+    check(sheet, FACT_SHEET_SCHEMA, "fact_sheet")
+    return sheet
+
+
+def render_fact_sheet(sheet: Dict) -> str:
+    """Compact JSON for prompts"""
+    return json.dumps(sheet, ensure_ascii=False, separators=(",", ":"))
+
+
+def fact_sheet_savings(prompt_rfp_data: Dict, sheet: Dict) -> Dict:
+    """Input tokens of the full parsed RFP vs. the fact sheet, per downstream agent and in total"""
+    full_tokens = estimate_tokens(str(prompt_rfp_data))
+    sheet_tokens = estimate_tokens(render_fact_sheet(sheet))
+    return {
+        "full_tokens": full_tokens,
+        "sheet_tokens": sheet_tokens,
+        "saved_per_agent": full_tokens - sheet_tokens,
+        "saved_total": (full_tokens - sheet_tokens) * len(FACT_SHEET_AGENTS),
+        "reduction_pct": round(100 * (full_tokens - sheet_tokens) / full_tokens, 1) if full_tokens else 0.0,
+    }
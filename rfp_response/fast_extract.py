@@ -0,0 +1,253 @@
+"""Deterministic fast-path extraction of budget, timeline and contact fields.
+
+Labelled values such as "Budget Range: $100,000 - $150,000" or "Project Duration:
+10-12 months" follow predictable patterns, so precompiled rules pull them out of the
+RFP text in milliseconds, before the LLM parse. Each hit carries a typed value
+(amounts, date ranges, durations) and a confidence score; fields at or above
+``CONFIDENCE_THRESHOLD`` are left out of the LLM schema and filled from here.
+"""
+import calendar
+import re
+import time
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+CONFIDENCE_THRESHOLD = 0.85
+CONFLICT_CONFIDENCE = 0.6  # rules disagree with each other: let the LLM decide
+CONTACT_WINDOW = 200  # characters after a contact label searched for its email/phone
+
+_AMOUNT = r"\$\s?\d[\d,]*(?:\.\d+)?\s?(?:[kKmM]\b|million\b|thousand\b)?"
+_SEP = r"\s*(?:-|–|—|to)\s*"
+_MONTHS = ("january|february|march|april|may|june|july|august|september|october|november|december|"
+           "jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec")
+_DATE = (rf"(?:(?:{_MONTHS})\.?\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}}"   # March 15, 2025
+         rf"|\d{{1,2}}\s+(?:{_MONTHS})\.?,?\s+\d{{4}}"                      # 15 March 2025
+         r"|\d{4}-\d{2}-\d{2}"                                              # 2025-03-15
+         r"|\d{1,2}/\d{1,2}/\d{4}"                                          # 03/15/2025
+         r"|Q[1-4]\s+\d{4}"                                                 # Q3 2025
+         rf"|(?:{_MONTHS})\.?\s+\d{{4}})")                                  # March 2025
+
+_BUDGET_RE = re.compile(
+    rf"(?P<label>budget(?:\s+range)?|total\s+budget|estimated\s+budget|maximum\s+budget|not\s+to\s+exceed|price\s+ceiling)"
+    rf"\s*[:\-]?\s*(?:of\s+|is\s+|up\s+to\s+)?(?P<low>{_AMOUNT})(?:{_SEP}(?P<high>{_AMOUNT}))?",
+    re.IGNORECASE,
+)
+_UNLABELLED_BUDGET_RE = re.compile(rf"(?P<low>{_AMOUNT}){_SEP}(?P<high>{_AMOUNT})", re.IGNORECASE)
+_DURATION_RE = re.compile(
+    r"(?P<label>project\s+duration|duration|timeline|period\s+of\s+performance|contract\s+term|project\s+timeline)"
+    r"\s*[:\-]\s*(?:approximately\s+|about\s+|up\s+to\s+)?"
+    r"(?P<low>\d+(?:\.\d+)?)(?:\s*(?:-|–|to)\s*(?P<high>\d+(?:\.\d+)?))?\s*(?P<unit>months?|weeks?|years?|days?)",
+    re.IGNORECASE,
+)
+_DELIVERY_RE = re.compile(
+    rf"(?P<label>expected\s+go-live|go-live(?:\s+date)?|launch\s+date|delivery\s+date|completion\s+date|project\s+completion|final\s+delivery)"
+    rf"\s*[:\-]?\s*(?:by\s+|no\s+later\s+than\s+)?(?P<date>{_DATE})",
+    re.IGNORECASE,
+)
+_START_RE = re.compile(
+    rf"(?P<label>(?:anticipated\s+|expected\s+|project\s+)?start\s+date|project\s+start|kick-?off(?:\s+date)?)"
+    rf"\s*[:\-]?\s*(?P<date>{_DATE})",
+    re.IGNORECASE,
+)
+_DEADLINE_RE = re.compile(
+    rf"(?P<label>submission\s+deadline|proposals?\s+(?:are\s+)?due(?:\s+(?:by|on))?|responses?\s+(?:are\s+)?due(?:\s+(?:by|on))?"
+    rf"|deadline\s+for\s+(?:submission|proposals|responses)|closing\s+date|due\s+date)"
+    rf"\s*[:\-]?\s*(?P<date>{_DATE})(?P<time>\s*(?:,|at)?\s*\d{{1,2}}(?::\d{{2}})?\s*(?:[ap]\.?m\.?)(?:\s*[A-Z]{{2,4}}\b)?)?",
+    re.IGNORECASE,
+)
+_CONTACT_RE = re.compile(
+    r"(?P<label>(?i:primary\s+contact|point\s+of\s+contact|contact\s+person|procurement\s+officer|contracting\s+officer|contact))"
+    r"\s*:\s*(?P<name>[A-Z][a-zA-Z.'-]+(?:\s+[A-Z][a-zA-Z.'-]+){0,3})",
+)
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+_PHONE_RE = re.compile(r"(?:\+?1[\s.-]?)?\(?\b\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}\b")
+
+_MONTH_NUMBERS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+_MONTH_NUMBERS.update({name.lower(): i for i, name in enumerate(calendar.month_abbr) if name})
+_MONTH_NUMBERS["sept"] = 9
+_UNIT_MONTHS = {"day": 1 / 30, "week": 12 / 52, "month": 1, "year": 12}
+
+
+def parse_amount(text: str) -> Optional[float]:
+    """'$1.2M' -> 1200000.0, '$75,000' -> 75000.0, '$150k' -> 150000.0"""
+    match = re.match(r"\$\s?(\d[\d,]*(?:\.\d+)?)\s?([kKmM]|million|thousand)?", text.strip())
+    if not match:
+        return None
+    value = float(match.group(1).replace(",", ""))
+    suffix = (match.group(2) or "").lower()
+    if suffix in ("k", "thousand"):
+        value *= 1_000
+    elif suffix in ("m", "million"):
+        value *= 1_000_000
+    return value
+
+
+def parse_date_range(text: str) -> Optional[Dict[str, str]]:
+    """ISO start/end dates for a date, month or quarter ("Q3 2025" -> Jul 1 - Sep 30)"""
+    text = re.sub(r"(\d)(st|nd|rd|th)\b", r"\1", text.strip().rstrip(".").replace(",", " "))
+    text = re.sub(r"\s+", " ", text)
+    try:
+        quarter = re.fullmatch(r"Q([1-4]) (\d{4})", text, re.IGNORECASE)
+        if quarter:
+            q, year = int(quarter.group(1)), int(quarter.group(2))
+            start = date(year, 3 * q - 2, 1)
+            end = date(year, 3 * q, calendar.monthrange(year, 3 * q)[1])
+            return {"start": start.isoformat(), "end": end.isoformat()}
+        iso = re.fullmatch(r"(\d{4})-(\d{2})-(\d{2})", text)
+        if iso:
+            day = date(int(iso.group(1)), int(iso.group(2)), int(iso.group(3)))
+            return {"start": day.isoformat(), "end": day.isoformat()}
+        us = re.fullmatch(r"(\d{1,2})/(\d{1,2})/(\d{4})", text)
+        if us:
+            day = date(int(us.group(3)), int(us.group(1)), int(us.group(2)))
+            return {"start": day.isoformat(), "end": day.isoformat()}
+        parts = text.replace(".", "").split(" ")
+        if len(parts) == 3:
+            if parts[0].isdigit():  # 15 March 2025
+                day_number, month, year = parts
+            else:                   # March 15 2025
+                month, day_number, year = parts
+            day = date(int(year), _MONTH_NUMBERS[month.lower()], int(day_number))
+            return {"start": day.isoformat(), "end": day.isoformat()}
+        if len(parts) == 2:         # March 2025
+            month, year = _MONTH_NUMBERS[parts[0].lower()], int(parts[1])
+            return {"start": date(year, month, 1).isoformat(),
+                    "end": date(year, month, calendar.monthrange(year, month)[1]).isoformat()}
+    except (KeyError, ValueError):
+        return None
+    return None
+
+
+def _field(value: str, typed: Dict, confidence: float, source: str) -> Dict:
+    return {"value": value, "typed": typed, "confidence": confidence, "source": source.strip()}
+
+
+def _budget(text: str) -> Optional[Dict]:
+    match = _BUDGET_RE.search(text)
+    if match:
+        confidence = 0.95 if match.group("high") or "budget" in match.group("label").lower() else 0.9
+    else:
+        match = _UNLABELLED_BUDGET_RE.search(text)
+        confidence = 0.6  # a dollar range with no "budget" label could be anything
+    if not match:
+        return None
+    low = parse_amount(match.group("low"))
+    high = parse_amount(match.group("high")) if match.group("high") else None
+    if low is None:
+        return None
+    if high is not None and high < low:
+        confidence = min(confidence, 0.5)
+    value = f"{match.group('low').strip()} - {match.group('high').strip()}" if high is not None else match.group("low").strip()
+    typed = {"min": low, "max": high if high is not None else low, "currency": "USD"}
+    return _field(value, typed, confidence, match.group(0))
+
+
+def _duration(text: str) -> Optional[Dict]:
+    # "Response timeline: 10 days ..." can precede "Project duration: 18 months"
+    fields = [_duration_field(match) for match in _DURATION_RE.finditer(text)]
+    if not fields:
+        return None
+    best = max(fields, key=lambda field: field["confidence"])  # first of the best-labelled
+    if any(field["typed"]["max_months"] != best["typed"]["max_months"] for field in fields):
+        best["confidence"] = min(best["confidence"], CONFLICT_CONFIDENCE)
+    return best
+
+
+def _duration_field(match: re.Match) -> Dict:
+    unit = match.group("unit").lower().rstrip("s")
+    low = float(match.group("low"))
+    high = float(match.group("high")) if match.group("high") else low
+    value = f"{match.group('low')}-{match.group('high')} {unit}s" if match.group("high") else f"{match.group('low')} {match.group('unit').lower()}"
+    typed = {
+        "min": low, "max": high, "unit": f"{unit}s",
+        "min_months": round(low * _UNIT_MONTHS[unit], 2), "max_months": round(high * _UNIT_MONTHS[unit], 2),
+    }
+    label = match.group("label").lower()
+    confidence = 0.95 if "duration" in label or "term" in label or "performance" in label else 0.9
+    return _field(value, typed, confidence if high >= low else 0.5, match.group(0))
+
+
+def _dated(pattern: re.Pattern, text: str, confidence: float) -> Optional[Dict]:
+    match = pattern.search(text)
+    if not match:
+        return None
+    date_text = match.group("date").strip()
+    typed = parse_date_range(date_text)
+    if typed is None:
+        return None
+    value = date_text
+    if "time" in pattern.groupindex and match.group("time"):
+        value = f"{date_text}{match.group('time').rstrip()}"
+        typed["time"] = match.group("time").strip(" ,").replace("at ", "")
+    if typed["start"] != typed["end"]:
+        confidence = round(confidence - 0.05, 2)  # quarter/month precision only
+    return _field(value, typed, confidence, match.group(0))
+
+
+def _contact(text: str) -> Optional[Dict]:
+    matches = list(_CONTACT_RE.finditer(text))
+    # A named role ("Primary Contact: ...") beats a bare "Contact: ..."
+    match = next((m for m in matches if m.group("label").lower() != "contact"), matches[0] if matches else None)
+    if match:
+        # The contact's own details follow the label; other addresses in the RFP belong to someone else
+        nearby = text[match.end():match.end() + CONTACT_WINDOW]
+        email, phone = _EMAIL_RE.search(nearby), _PHONE_RE.search(nearby)
+    else:
+        emails = {m.group(0).lower() for m in _EMAIL_RE.finditer(text)}
+        email, phone = _EMAIL_RE.search(text), None
+        if not email:
+            return None
+    typed = {"name": match.group("name").strip() if match else None,
+             "email": email.group(0) if email else None,
+             "phone": phone.group(0) if phone else None}
+    value = ", ".join(part for part in (typed["name"], typed["email"], typed["phone"]) if part)
+    if match:
+        confidence = 0.9 if email else 0.8
+    else:
+        confidence = 0.7 if len(emails) == 1 else CONFLICT_CONFIDENCE
+    return _field(value, typed, confidence, match.group(0) if match else email.group(0))
+
+
+# (section, field) -> rule
+_RULES = [
+    (("budget_information", "budget_range"), _budget),
+    (("timeline_constraints", "project_duration"), _duration),
+    (("timeline_constraints", "delivery_date"), lambda text: _dated(_DELIVERY_RE, text, 0.95)),
+    (("timeline_constraints", "start_date"), lambda text: _dated(_START_RE, text, 0.9)),
+    (("contact_information", "submission_deadline"), lambda text: _dated(_DEADLINE_RE, text, 0.95)),
+    (("contact_information", "primary_contact"), _contact),
+]
+
+
+def fast_extract(text: str) -> Dict:
+    """Run every rule over the RFP text.
+
+    Returns ``{"fields": {"section.field": {...}}, "elapsed_ms": float}`` where each field
+    has the display ``value``, a ``typed`` value, a ``confidence`` and the matched ``source``.
+    """
+    started = time.perf_counter()
+    fields = {}
+    for (section, field), rule in _RULES:
+        result = rule(text)
+        if result:
+            fields[f"{section}.{field}"] = result
+    return {"fields": fields, "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+def confident_fields(fast_result: Dict, threshold: float = CONFIDENCE_THRESHOLD) -> List[Tuple[str, str]]:
+    """(section, field) pairs confident enough to leave out of the LLM schema"""
+    return [tuple(path.split(".", 1)) for path, result in fast_result.get("fields", {}).items()
+            if result["confidence"] >= threshold]
+
+
+def apply_fast_path(parsed_data: Dict, fast_result: Dict, threshold: float = CONFIDENCE_THRESHOLD) -> Dict:
+    """Fill fast-path values into parsed data; confident values win, others only fill gaps"""
+    for path, result in fast_result.get("fields", {}).items():
+        section, field = path.split(".", 1)
+        target = parsed_data.get(section)
+        if not isinstance(target, dict):
+            target = parsed_data[section] = {}
+        if result["confidence"] >= threshold or not target.get(field):
+            target[field] = result["value"]
+    parsed_data["_fast_path"] = fast_result
+    return parsed_data
@@ -0,0 +1,331 @@
+"""Per-route model configuration for the parser and each agent.
+
+Every LLM call goes through a named route ("RFP Parser", "Tech Lead Agent", ...) that
+picks its own Azure deployment, temperature and max_tokens, with an optional fallback
+deployment used when the primary call fails. Routes are read from JSON in
+``RFP_MODEL_ROUTES`` (inline) or ``RFP_MODEL_ROUTES_FILE`` (path), merged over the
+defaults below, e.g.::
+
+    {"default": {"deployment": "gpt-4o"},
+     "Sales/Marketing Agent": {"deployment": "gpt-4o-mini", "fallback_deployment": "gpt-4o"}}
+
+Setting ``AZURE_OPENAI_FAST_DEPLOYMENT_NAME`` routes the lighter sections (orchestrator
+breakdown, sales/marketing) to that deployment without writing any JSON.
+Latency, errors and fallbacks are recorded per route. Identical concurrent calls (same
+route settings and messages, e.g. two sessions on the same RFP) share one request.
+
+Agent completions cut off by ``max_tokens`` (``finish_reason == "length"``) are resumed
+with continuation requests, up to the route's ``max_continuations``, and stitched into
+one text; truncations and continuations are counted per route.
+
+Every attempt holds a slot of the process-wide adaptive concurrency limiter
+(``concurrency.py``), so the number of calls in flight tracks the deployment's quota.
+
+Routes with ``"hedge": true`` hedge stalled calls: if the primary attempt has not
+returned after the route's ``hedge_percentile`` of recent latency, a duplicate goes to
+``hedge_deployment`` (default: the same deployment) and the first success wins. Hedges
+spend a per-router budget (``HEDGE_BUDGET`` of calls, at most ``HEDGE_BURST`` at once).
+Calls are not streamed, so the trigger is the whole response rather than its first
+token; a losing attempt is cancelled if it has not started and otherwise ignored.
+
+Each call (all deployments tried) passes through the router's ``CircuitBreaker``, which
+fails fast with ``CircuitOpenError`` while Azure OpenAI is down. A route's ``timeout``
+(seconds) bounds how long a stalled call counts as pending, so stalls reach the breaker
+as failures: ``RFP_ROUTE_TIMEOUT_SECONDS`` (default 120) for agents and
+``RFP_PARSE_TIMEOUT_SECONDS`` (default 240) for the longer parse; ``null`` uses the
+client's own.
+
+``RFP_CASSETTE_MODE`` records every attempt to, or replays it from, a cassette file
+(``cassette.py``) beneath all of the above.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+from langchain.schema import AIMessage, HumanMessage
+from langchain_openai import AzureChatOpenAI
+
+from cassette import CHAT, INVOKE, get_cassette
+from circuit_breaker import CircuitBreaker
+from concurrency import get_concurrency_limiter
+from singleflight import fingerprint, get_singleflight
+
+PARSE_ROUTE = "RFP Parser"
+LIGHT_ROUTES = ["Proposal Orchestrator Agent", "Sales/Marketing Agent"]
+LATENCY_SAMPLES = 200
+STITCH_OVERLAP_CHARS = 300
+HEDGE_BUDGET = 0.1
+HEDGE_BURST = 3.0
+HEDGE_MIN_SAMPLES = 10
+HEDGE_WORKERS = int(os.getenv("RFP_HEDGE_WORKERS", "16"))
+ROUTE_TIMEOUT_SECONDS = float(os.getenv("RFP_ROUTE_TIMEOUT_SECONDS", "120"))
+PARSE_TIMEOUT_SECONDS = float(os.getenv("RFP_PARSE_TIMEOUT_SECONDS", "240"))
+
+CONTINUE_PROMPT = ("Your previous response was cut off. Continue exactly where it stopped, mid-sentence or "
+                   "mid-table if needed, without repeating anything or adding a preamble.")
+
+DEFAULT_ROUTE = {"deployment": None, "temperature": 0.3, "max_tokens": 2500, "fallback_deployment": None,
+                 "max_continuations": 2, "hedge": False, "hedge_percentile": 95, "hedge_deployment": None,
+                 "timeout": ROUTE_TIMEOUT_SECONDS}
+DEFAULT_ROUTES = {
+    PARSE_ROUTE: {"temperature": 0.1, "max_tokens": 4000, "timeout": PARSE_TIMEOUT_SECONDS},
+}
+
+
+def load_route_config() -> Dict[str, Dict]:
+    """Route overrides from the environment (inline JSON wins over the file)"""
+    raw = os.getenv("RFP_MODEL_ROUTES")
+    path = os.getenv("RFP_MODEL_ROUTES_FILE")
+    if not raw and path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            raw = f.read()
+    if not raw:
+        return {}
+    try:
+        routes = json.loads(raw)
+    except json.JSONDecodeError as e:
+        print(f"Ignoring invalid model route config: {e}")
+        return {}
+    return routes if isinstance(routes, dict) else {}
+
+
+class ModelRouter:
+    """Resolves routes to deployments, caches one LangChain client per setting, tracks latency"""
+
+    def __init__(self, config, routes: Optional[Dict[str, Dict]] = None):
+        self.config = config
+        self.routes = routes if routes is not None else load_route_config()
+        self._llms = {}
+        self._metrics: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.limiter = get_concurrency_limiter()
+        self._hedge_tokens = HEDGE_BURST
+        self.breaker = CircuitBreaker()
+        self.cassette = get_cassette()
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.config.api_key and self.config.endpoint)
+
+    def route(self, name: str) -> Dict:
+        """Effective settings for a route: defaults < built-in route < "default" override < route override"""
+        route = dict(DEFAULT_ROUTE, deployment=self.config.deployment_name)
+        route.update(DEFAULT_ROUTES.get(name, {}))
+        fast_deployment = os.getenv("AZURE_OPENAI_FAST_DEPLOYMENT_NAME")
+        if fast_deployment and name in LIGHT_ROUTES:
+            route.update(deployment=fast_deployment, fallback_deployment=self.config.deployment_name)
+        route.update(self.routes.get("default", {}))
+        route.update(self.routes.get(name, {}))
+        return route
+
+    def llm(self, deployment: str, temperature: float, max_tokens: int, timeout: Optional[float] = None):
+        """LangChain chat model for one deployment/setting (created once per process)"""
+        key = (deployment, temperature, max_tokens, timeout)
+        with self._lock:
+            if key not in self._llms:
+                self._llms[key] = AzureChatOpenAI(
+                    azure_endpoint=self.config.endpoint,
+                    api_key=self.config.api_key,
+                    api_version=self.config.api_version,
+                    azure_deployment=deployment,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=timeout
+                )
+            return self._llms[key]
+
+    def _deployments(self, route: Dict) -> List[str]:
+        deployments = [route["deployment"]]
+        if route.get("fallback_deployment") and route["fallback_deployment"] != route["deployment"]:
+            deployments.append(route["fallback_deployment"])
+        return deployments
+
+    def _call(self, name: str, attempt):
+        """Run ``attempt(route, deployment)`` on the primary deployment, then the fallback"""
+        route = self.route(name)
+        self.breaker.before_call()
+        last_error = None
+        for i, deployment in enumerate(self._deployments(route)):
+            started = time.perf_counter()
+            try:
+                if route.get("hedge") and i == 0:
+                    result, deployment = self._hedged(name, route, deployment, attempt)
+                else:
+                    with self.limiter.slot(name):
+                        result = attempt(route, deployment)
+            except Exception as e:
+                self._record(name, deployment, time.perf_counter() - started, error=True, fallback=i > 0)
+                last_error = e
+                continue
+            self._record(name, deployment, time.perf_counter() - started, error=False, fallback=i > 0)
+            self.breaker.record_success()
+            return result
+        self.breaker.record_failure(last_error)
+        raise last_error
+
+    def hedge_delay(self, name: str, percentile: float) -> Optional[float]:
+        """Seconds to wait before hedging: the route's latency percentile (None until enough samples)"""
+        with self._lock:
+            latencies = sorted(self._route_metrics(name)["latencies"])
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return latencies[min(int(len(latencies) * percentile / 100), len(latencies) - 1)]
+
+    def _take_hedge_token(self, name: str) -> bool:
+        with self._lock:
+            if self._hedge_tokens < 1:
+                self._route_metrics(name)["hedges_skipped"] += 1
+                return False
+            self._hedge_tokens -= 1
+            self._route_metrics(name)["hedges"] += 1
+            return True
+
+    def _hedged(self, name: str, route: Dict, deployment: str, attempt):
+        """Primary attempt plus, if it stalls past the hedge delay, a duplicate; first success wins"""
+        def run(target):
+            with self.limiter.slot(name):
+                return attempt(route, target)
+
+        with self._lock:
+            # Every hedgeable call earns a fraction of a hedge
+            self._hedge_tokens = min(HEDGE_BURST, self._hedge_tokens + HEDGE_BUDGET)
+        delay = self.hedge_delay(name, route.get("hedge_percentile") or 95)
+        primary = _hedge_executor.submit(run, deployment)
+        done, _ = wait([primary], timeout=delay)
+        if done or delay is None or not self._take_hedge_token(name):
+            return primary.result(), deployment
+
+        hedge_deployment = route.get("hedge_deployment") or deployment
+        attempts = {primary: deployment, _hedge_executor.submit(run, hedge_deployment): hedge_deployment}
+        pending = set(attempts)
+        first_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    first_error = first_error or future.exception()
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                if future is not primary:
+                    self._count(name, "hedge_wins")
+                return future.result(), attempts[future]
+        raise first_error
+
+    def invoke(self, name: str, messages):
+        """LangChain ``invoke`` on the route's model"""
+        def attempt(route, deployment):
+            return self.llm(deployment, route["temperature"], route["max_tokens"], route.get("timeout")).invoke(messages)
+
+        request = [(message.type, message.content) for message in messages]
+        if self.cassette is not None:
+            attempt = self.cassette.wrap(INVOKE, name, request, attempt)
+        key = fingerprint(name, self.route(name), request)
+        return get_singleflight("llm").do(key, lambda: self._call(name, attempt))
+
+    def complete(self, name: str, messages) -> str:
+        """Text of an ``invoke``, continued while the model stops on ``max_tokens``"""
+        response = self.invoke(name, messages)
+        text = response.content
+        if _finish_reason(response) != "length":
+            return text
+        self._count(name, "truncations")
+        for _ in range(self.route(name).get("max_continuations") or 0):
+            self._count(name, "continuations")
+            response = self.invoke(name, list(messages) + [AIMessage(content=text), HumanMessage(content=CONTINUE_PROMPT)])
+            text = stitch(text, response.content)
+            if _finish_reason(response) != "length":
+                return text
+        self._count(name, "still_truncated")
+        return text
+
+    def chat_completion(self, name: str, client, messages: List[Dict], **kwargs):
+        """Raw ``openai`` chat completion on the route's deployment"""
+        def attempt(route, deployment):
+            return client.chat.completions.create(
+                model=deployment, messages=messages,
+                temperature=route["temperature"], max_tokens=route["max_tokens"],
+                **dict({"timeout": route["timeout"]} if route.get("timeout") else {}, **kwargs))
+
+        if self.cassette is not None:
+            attempt = self.cassette.wrap(CHAT, name, [messages, kwargs], attempt)
+        key = fingerprint(name, self.route(name), messages, kwargs)
+        return get_singleflight("llm").do(key, lambda: self._call(name, attempt))
+
+    def _route_metrics(self, name: str) -> Dict:
+        return self._metrics.setdefault(name, {
+            "calls": 0, "errors": 0, "fallbacks": 0, "truncations": 0, "continuations": 0, "still_truncated": 0,
+            "hedges": 0, "hedge_wins": 0, "hedges_skipped": 0,
+            "deployments": set(), "latencies": deque(maxlen=LATENCY_SAMPLES),
+        })
+
+    def _count(self, name: str, counter: str):
+        with self._lock:
+            self._route_metrics(name)[counter] += 1
+
+    def _record(self, name: str, deployment: str, seconds: float, error: bool, fallback: bool):
+        with self._lock:
+            metrics = self._route_metrics(name)
+            metrics["calls"] += 1
+            metrics["errors"] += int(error)
+            metrics["fallbacks"] += int(fallback and not error)
+            metrics["deployments"].add(deployment)
+            if not error:
+                metrics["latencies"].append(seconds)
+
+    def metrics(self) -> List[Dict]:
+        """Per-route latency summary (seconds) for display"""
+        rows = []
+        with self._lock:
+            snapshot = {name: dict(m, latencies=sorted(m["latencies"])) for name, m in self._metrics.items()}
+        for name, m in snapshot.items():
+            latencies = m["latencies"]
+            rows.append({
+                "Route": name,
+                "Deployment": ", ".join(sorted(m["deployments"])),
+                "Calls": m["calls"],
+                "Errors": m["errors"],
+                "Fallbacks": m["fallbacks"],
+                "Truncated": m["truncations"],
+                "Continuations": m["continuations"],
+                "Still Truncated": m["still_truncated"],
+                "Hedged": m["hedges"],
+                "Hedge Wins": m["hedge_wins"],
+                "Hedges Over Budget": m["hedges_skipped"],
+                "p50 (s)": round(latencies[len(latencies) // 2], 2) if latencies else None,
+                "p95 (s)": round(latencies[max(int(len(latencies) * 0.95) - 1, 0)], 2) if latencies else None,
+                "Mean (s)": round(sum(latencies) / len(latencies), 2) if latencies else None,
+            })
+        return rows
+
+
+def _finish_reason(response) -> Optional[str]:
+    return (getattr(response, "response_metadata", None) or {}).get("finish_reason")
+
+
+def stitch(text: str, continuation: str) -> str:
+    """Join a continuation onto the text it resumes, dropping any repeated overlap"""
+    limit = min(len(text), len(continuation), STITCH_OVERLAP_CHARS)
+    for size in range(limit, 15, -1):
+        if text.endswith(continuation[:size]):
+            return text + continuation[size:]
+    return text + continuation
+
+
+_hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="llm-hedge")
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_model_router(config) -> ModelRouter:
+    """Process-wide router (so latency metrics cover every session)"""
+    global _router
+    with _router_lock:
+        if _router is None or (_router.config.endpoint, _router.config.api_key) != (config.endpoint, config.api_key):
+            _router = ModelRouter(config)
+        return _router
@@ -0,0 +1,136 @@
+"""Text normalization before parsing: repeated page furniture and whitespace.
+
+Extracted PDF text carries the same running headers, footers, page numbers and legal
+boilerplate on every page (pages are separated by form feeds, ``\\f``). Lines that
+recur in the top/bottom lines of enough pages, or anywhere on most pages, are removed;
+runs of spaces and blank lines are collapsed. The edge window is at most ``EDGE_LINES``
+and at most ``EDGE_FRACTION`` of a page, so short pages keep their body text. Only a
+page's first and last line are matched ignoring digits ("Page 3 of 40"); other edge
+lines must repeat exactly. Page-number lines at page edges are removed from multi-page
+documents (a single-page TXT/DOCX has no page numbers).
+
+The result keeps an offset map (normalized line start -> original offset) so any
+position in the normalized text can be traced back to the extracted original.
+"""
+import bisect
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from text_utils import estimate_tokens
+
+EDGE_LINES = 3              # lines at the top/bottom of a page checked for headers/footers
+EDGE_FRACTION = 0.2         # ... but never more than this share of the page's lines
+EDGE_REPEAT_RATIO = 0.5     # share of pages an edge line must appear on to count as furniture
+BODY_REPEAT_RATIO = 0.8     # share of pages a long line must appear on anywhere to count as boilerplate
+MIN_BOILERPLATE_CHARS = 20
+
+_PAGE_NUMBER_RE = re.compile(r"^(?:page\s*)?\d{1,4}(?:\s*(?:of|/)\s*\d{1,4})?$|^-\s*\d{1,4}\s*-$", re.IGNORECASE)
+_SPACES_RE = re.compile(r"[ \t ]+")
+
+
+def _exact(line: str) -> str:
+    return _SPACES_RE.sub(" ", line.strip().lower())
+
+
+def _canonical(line: str) -> str:
+    """Digit-insensitive form, so "Page 3 of 40" and "Page 4 of 40" count as the same line"""
+    return re.sub(r"\d+", "#", _exact(line))
+
+
+class NormalizedText:
+    """Normalized text plus a line-level map back to offsets in the original"""
+
+    def __init__(self, text: str, segments: List[Tuple[int, int, int]], report: Dict):
+        self.text = text
+        self.segments = segments  # (normalized start, original start, original line length)
+        self._starts = [segment[0] for segment in segments]
+        self.report = report
+
+    def to_original(self, offset: int) -> int:
+        """Original offset for a position in the normalized text (exact at line starts)"""
+        if not self.segments:
+            return offset
+        i = max(bisect.bisect_right(self._starts, offset) - 1, 0)
+        normalized_start, original_start, length = self.segments[i]
+        return original_start + min(max(offset - normalized_start, 0), length)
+
+
+def _edge_keys(lines: List[str]) -> Dict[int, str]:
+    """Line index -> header/footer match key for the lines in a page's top/bottom window"""
+    non_empty = [i for i, line in enumerate(lines) if line.strip()]
+    if not non_empty:
+        return {}
+    window = max(1, min(EDGE_LINES, int(len(non_empty) * EDGE_FRACTION)))
+    keys = {i: "=" + _exact(lines[i]) for i in non_empty[:window] + non_empty[-window:]}
+    # The outermost lines carry running page counters, so only they ignore digits
+    for i in (non_empty[0], non_empty[-1]):
+        keys[i] = "#" + _canonical(lines[i])
+    return keys
+
+
+def _repeated_lines(pages: List[List[str]]) -> Tuple[set, set]:
+    """Running header/footer keys (page edges only) and boilerplate lines (exact, anywhere)"""
+    if len(pages) < 2:
+        return set(), set()
+    edge_counts, body_counts = Counter(), Counter()
+    for lines in pages:
+        non_empty = [line for line in lines if line.strip()]
+        edge_counts.update(set(_edge_keys(lines).values()))
+        body_counts.update({_exact(line) for line in non_empty if len(line.strip()) >= MIN_BOILERPLATE_CHARS})
+    edge_min = max(2, EDGE_REPEAT_RATIO * len(pages))
+    body_min = max(2, BODY_REPEAT_RATIO * len(pages))
+    edge_lines = {key for key, count in edge_counts.items() if count >= edge_min and len(key) > 1}
+    boilerplate = {line for line, count in body_counts.items() if count >= body_min and line}
+    return edge_lines, boilerplate
+
+
+def normalize_text(text: str) -> NormalizedText:
+    """Strip repeated headers/footers/page numbers/boilerplate and collapse whitespace"""
+    pages = [page.split("\n") for page in text.split("\f")]
+    edge_lines, boilerplate = _repeated_lines(pages)
+
+    out: List[str] = []
+    segments: List[Tuple[int, int, int]] = []
+    removed = Counter()
+    normalized_length = 0
+    original_offset = 0
+    blank_run = 0
+    for lines in pages:
+        edge_keys = _edge_keys(lines)
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            at_edge = i in edge_keys
+            if stripped and at_edge and len(pages) > 1 and _PAGE_NUMBER_RE.match(stripped):
+                removed["page number"] += 1
+            elif stripped and at_edge and edge_keys[i] in edge_lines:
+                removed["header/footer"] += 1
+            elif stripped and _exact(line) in boilerplate:
+                removed["boilerplate"] += 1
+            elif not stripped:
+                blank_run += 1
+                if blank_run == 1 and out:
+                    out.append("")
+                    normalized_length += 1
+            else:
+                blank_run = 0
+                collapsed = _SPACES_RE.sub(" ", stripped)
+                segments.append((normalized_length, original_offset + (len(line) - len(line.lstrip())), len(line)))
+                out.append(collapsed)
+                normalized_length += len(collapsed) + 1
+            original_offset += len(line) + 1  # the "\n" after the line (or "\f" after a page's last line)
+
+    normalized = "\n".join(out).rstrip() + "\n"
+    original_tokens = estimate_tokens(text)
+    normalized_tokens = estimate_tokens(normalized)
+    report = {
+        "pages": len(pages),
+        "repeated_patterns": sorted({key[1:] for key in edge_lines} | boilerplate),
+        "lines_removed": sum(removed.values()),
+        "removed_by_kind": dict(removed),
+        "original_tokens": original_tokens,
+        "normalized_tokens": normalized_tokens,
+        "tokens_saved": original_tokens - normalized_tokens,
+        "reduction_pct": round(100 * (original_tokens - normalized_tokens) / original_tokens, 1) if original_tokens else 0.0,
+    }
+    return NormalizedText(normalized, segments, report)
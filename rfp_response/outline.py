@@ -0,0 +1,155 @@
+"""Section outline of an RFP document.
+
+Built once after text extraction: headings ("Project Overview:", "3.2 Security",
+"## Scope", all-caps titles) are detected line by line and each section records its
+character offsets and token count. Agents can then be handed only the raw sections
+relevant to them, by name or keyword, with plain offset slicing of the source text.
+"""
+import re
+from typing import Dict, Iterable, List, Optional
+
+from text_utils import estimate_tokens
+
+SOURCE_TOKEN_BUDGET = 1200
+TITLE_SUBTREE_FRACTION = 0.6  # a level-1 heading nesting more of the document than this is its title
+
+_NUMBERED_RE = re.compile(r"^(?P<number>\d+(?:\.\d+){0,3})[.)]?\s+(?P<title>[A-Z][^\n]{1,80}?)\s*:?$")
+_COLON_RE = re.compile(r"^(?P<title>[A-Z][A-Za-z0-9 &/,'()\-]{2,60}):$")
+_MARKDOWN_RE = re.compile(r"^(?P<hashes>#{1,6})\s+(?P<title>.{2,100})$")
+_CAPS_RE = re.compile(r"^(?P<title>[A-Z0-9][A-Z0-9 &/,'()\-:.]{3,100})$")
+_FIELD_RE = re.compile(r"^\s*(?:[-*•]\s*)?(?P<title>[A-Z][A-Za-z0-9 &/()\-]{2,40}):\s+\S")
+
+# Raw sections each agent gets, matched against section titles
+AGENT_SECTION_KEYWORDS = {
+    "Proposal Orchestrator Agent": ["overview", "scope", "background", "objective", "introduction", "summary", "requirement"],
+    "Tech Lead Agent": ["technical", "technology", "architecture", "integration", "security", "infrastructure",
+                        "hosting", "platform", "data", "functional", "feature"],
+    "Estimation Agent": ["budget", "pricing", "price", "cost", "payment", "fee", "scope", "deliverable"],
+    "Timeline Agent": ["timeline", "schedule", "milestone", "duration", "deliverable", "phase", "implementation"],
+    "Legal & Compliance Agent": ["compliance", "legal", "regulatory", "contract", "terms", "insurance", "privacy",
+                                 "security", "certification", "liability"],
+    "Sales/Marketing Agent": ["evaluation", "selection", "criteria", "overview", "objective", "vendor",
+                              "qualification", "background"],
+}
+
+
+def _heading(line: str) -> Optional[Dict]:
+    stripped = line.strip()
+    if not stripped or len(stripped) > 100:
+        return None
+    match = _MARKDOWN_RE.match(stripped)
+    if match:
+        return {"title": match.group("title").strip("# "), "number": "", "level": len(match.group("hashes"))}
+    match = _NUMBERED_RE.match(stripped)
+    if match and not stripped.endswith((".", ",", ";")):
+        number = match.group("number")
+        return {"title": match.group("title").strip(), "number": number, "level": number.count(".") + 1}
+    match = _COLON_RE.match(stripped)
+    if match:
+        return {"title": match.group("title").strip(), "number": "", "level": 2}
+    match = _CAPS_RE.match(stripped)
+    if match and sum(c.isalpha() for c in stripped) >= 4:
+        return {"title": stripped.rstrip(":"), "number": "", "level": 1}
+    return None
+
+
+def _key(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", name.lower()).strip()
+
+
+class OutlineIndex:
+    """Headings of a document with [start, end) character offsets and token counts.
+
+    ``end`` is where the section's own body stops; ``subtree_end`` also covers its
+    numbered/nested subsections, except under a document title ("REQUEST FOR PROPOSAL")
+    that would nest most of the document. Labelled one-line values ("Budget Range:
+    $100,000") are indexed separately as ``fields`` so they can be handed out without
+    their section.
+    """
+
+    def __init__(self, sections: List[Dict], text_length: int, fields: Optional[List[Dict]] = None):
+        self.sections = sections
+        self.text_length = text_length
+        self.fields = fields or []
+        self._by_name = {}
+        for i, section in enumerate(sections):
+            self._by_name.setdefault(_key(section["title"]), i)
+            if section["number"]:
+                self._by_name.setdefault(section["number"], i)
+
+    @classmethod
+    def build(cls, text: str) -> "OutlineIndex":
+        sections: List[Dict] = []
+        fields: List[Dict] = []
+        offset = 0
+        for line in text.splitlines(keepends=True):
+            heading = _heading(line)
+            if heading:
+                if sections:
+                    sections[-1]["end"] = offset
+                elif text[:offset].strip():
+                    sections.append({"title": "Preamble", "number": "", "level": 1, "start": 0, "end": offset})
+                sections.append({**heading, "start": offset, "end": len(text)})
+            else:
+                field = _FIELD_RE.match(line)
+                if field:
+                    fields.append({"title": field.group("title").strip(), "start": offset, "end": offset + len(line)})
+            offset += len(line)
+        if not sections and text.strip():
+            sections.append({"title": "Document", "number": "", "level": 1, "start": 0, "end": len(text)})
+
+        for i, section in enumerate(sections):
+            section["subtree_end"] = next(
+                (later["start"] for later in sections[i + 1:] if later["level"] <= section["level"]), len(text)
+            )
+            if section["level"] == 1 and section["subtree_end"] - section["end"] > TITLE_SUBTREE_FRACTION * len(text):
+                section["subtree_end"] = section["end"]
+            section["tokens"] = estimate_tokens(text[section["start"]:section["end"]])
+            section["subtree_tokens"] = estimate_tokens(text[section["start"]:section["subtree_end"]])
+        for field in fields:
+            field["tokens"] = estimate_tokens(text[field["start"]:field["end"]])
+        return cls(sections, len(text), fields)
+
+    def to_dict(self) -> Dict:
+        return {"sections": self.sections, "text_length": self.text_length, "fields": self.fields}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "OutlineIndex":
+        return cls(data.get("sections", []), data.get("text_length", 0), data.get("fields", []))
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Section by title (case/punctuation-insensitive) or number, e.g. "Technical Requirements" or "3.2" """
+        i = self._by_name.get(name) if name in self._by_name else self._by_name.get(_key(name))
+        return self.sections[i] if i is not None else None
+
+    def slice(self, text: str, name: str) -> str:
+        section = self.get(name)
+        return text[section["start"]:section["end"]] if section else ""
+
+    def find(self, keywords: Iterable[str], include_fields: bool = False) -> List[Dict]:
+        """Sections (and optionally labelled fields) whose title mentions any keyword, in document order"""
+        keywords = [keyword.lower() for keyword in keywords]
+        entries = self.sections + (self.fields if include_fields else [])
+        return sorted((entry for entry in entries if any(keyword in entry["title"].lower() for keyword in keywords)),
+                      key=lambda entry: entry["start"])
+
+    def excerpt(self, text: str, keywords: Iterable[str], token_budget: int = SOURCE_TOKEN_BUDGET) -> str:
+        """Matching sections (with their subsections) and fields, in document order, within ``token_budget``"""
+        spans, used = [], 0
+        for entry in self.find(keywords, include_fields=True):
+            start = entry["start"]
+            end, tokens = entry.get("subtree_end", entry["end"]), entry.get("subtree_tokens", entry["tokens"])
+            if tokens > token_budget - used:
+                end, tokens = entry["end"], entry["tokens"]  # fall back to the section's own body
+            if any(s <= start < e for s, e in spans) or used + tokens > token_budget:
+                continue
+            spans.append((start, end))
+            used += tokens
+        return "\n\n".join(text[start:end].strip() for start, end in sorted(spans))
+
+
+def agent_source_sections(outline: OutlineIndex, text: str,
+                          token_budget: int = SOURCE_TOKEN_BUDGET) -> Dict[str, str]:
+    """Raw RFP sections relevant to each agent (empty when nothing matches)"""
+    return {agent: outline.excerpt(text, keywords, token_budget)
+            for agent, keywords in AGENT_SECTION_KEYWORDS.items()}
@@ -0,0 +1,295 @@
+"""Company profile registry with precompiled prompt templates.
+
+Each business unit is one JSON file in ``profiles/`` (or ``RFP_PROFILES_DIR``); the file
+name is the profile id. When a profile is loaded its company context blocks and every
+parse/agent prompt template are rendered once with the profile's fields, leaving
+``string.Template`` placeholders (``$rfp_data``, ``$feedback_context``, ...) for the
+per-request parts, so assembling a prompt is a single substitution.
+
+Files are re-checked at most every ``RELOAD_INTERVAL`` seconds and only a changed
+profile is recompiled. Each compiled profile carries a content ``version``; cached LLM
+results keyed on it (speculative runs, the warm-cache bundle) go stale only for that
+profile. A profile file may override any template under ``"prompts"``.
+
+Run ``python profiles.py`` to benchmark per-request prompt assembly.
+"""
+import hashlib
+import json
+import os
+import string
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from subsections import numbered_items
+
+PROFILES_DIR = os.getenv("RFP_PROFILES_DIR", str(Path(__file__).with_name("profiles")))
+DEFAULT_PROFILE_ID = os.getenv("RFP_DEFAULT_PROFILE", "techvision")
+RELOAD_INTERVAL = 2.0
+
+PARSE_SYSTEM_PROMPT = "RFP Parser System"
+PARSE_PROMPT = "RFP Parser"
+
+# Profile fields in {braces} are filled at compile time, $placeholders per request
+PROMPT_TEMPLATES = {
+    PARSE_SYSTEM_PROMPT: "You are an expert RFP analyst working for {name}. Always respond with valid JSON format and consider our company's competitive advantages.",
+    PARSE_PROMPT: """$company_context
+
+You are an expert RFP analyst working for {name}. Analyze the following RFP document and extract key information that will help our specialized agents create a winning proposal.
+
+RFP Document:
+$rfp_text
+
+Please analyze this RFP from {name}'s perspective and provide a JSON response with the following structure:
+
+$schema
+
+Consider {name}'s strengths and how we can position ourselves competitively. Ensure the response is valid JSON.
+""",
+    "Proposal Orchestrator Agent": """$company_context
+
+You are a Proposal Orchestrator Agent working for {name}. Based on the RFP analysis below, create a comprehensive project breakdown.
+
+RFP Data: $rfp_data
+
+Create a detailed response covering:
+1. Project scope overview and understanding from {name}'s perspective
+2. Key components identification and prioritization based on our expertise
+3. Risk assessment and mitigation strategies leveraging our experience
+4. Success criteria and metrics aligned with our proven methodologies
+
+Format as a professional proposal section with clear headings. Emphasize {name}'s relevant experience and capabilities.""",
+    "Tech Lead Agent": """$company_context
+
+You are a Technical Lead Agent representing {name}. Design the technical architecture based on our proven expertise.
+
+RFP Data: $rfp_data
+$feedback_context
+
+Provide:
+1. Recommended technology stack leveraging {name}'s specializations
+2. System architecture design based on our enterprise experience
+3. Security implementation strategy aligned with our ISO 27001 and SOC 2 certifications
+4. Development methodology using our proven Agile processes
+
+Be specific about technologies and highlight how {name}'s expertise ensures successful implementation.""",
+    "Estimation Agent": """$company_context
+
+You are an Estimation Agent for {name}. Provide detailed cost estimates based on our proven delivery track record.
+
+RFP Fact Sheet (shared by every section of this proposal; keep all figures consistent with it): $fact_sheet
+$feedback_context
+
+Provide:
+1. Work breakdown structure based on {name}'s proven methodologies
+2. Effort estimation by component using our historical data and expertise
+3. Resource allocation leveraging our {employees} team
+4. Total project cost with breakdown, highlighting our competitive advantage of 15% faster delivery
+
+Reference our portfolio of 200+ successful projects for credibility.""",
+    "Timeline Agent": """$company_context
+
+You are a Timeline Agent for {name}. Create project timeline based on our proven delivery methodologies.
+
+RFP Fact Sheet (shared by every section of this proposal; keep all figures consistent with it): $fact_sheet
+$feedback_context
+
+Develop:
+1. Project phases and milestones using {name}'s Agile methodology
+2. Task breakdown and dependencies based on our proven processes
+3. Resource scheduling leveraging our global team capabilities
+4. Delivery schedule with key dates, emphasizing our track record of 15% faster delivery
+
+Highlight our weekly client demos and 24/7 global support coverage.""",
+    "Legal & Compliance Agent": """$company_context
+
+You are a Legal & Compliance Agent for {name}. Provide legal guidance based on our certifications and compliance expertise.
+
+RFP Data: $rfp_data
+$feedback_context
+
+Address:
+1. Regulatory compliance requirements leveraging our ISO 27001 and SOC 2 Type II certifications
+2. Data protection considerations based on our GDPR compliance expertise
+3. Contract terms recommendations from our experience with Fortune 500 clients
+4. Risk assessment using insights from our 200+ successful projects
+
+Emphasize {name}'s proven compliance track record and industry certifications.""",
+    "Sales/Marketing Agent": """$company_context
+
+You are a Sales/Marketing Agent for {name}. Create compelling value propositions highlighting our competitive advantages.
+
+RFP Fact Sheet (shared by every section of this proposal; keep all figures consistent with it): $fact_sheet
+$feedback_context
+
+Develop:
+1. Executive summary showcasing {name}'s unique value proposition
+2. Company capabilities highlighting our specializations and achievements
+3. Competitive advantages including our 99.5% client retention rate and recent awards
+4. Client benefits and ROI based on our track record of saving clients 40% operational costs
+
+Create a compelling closing that positions {name} as the ideal partner for this project.""",
+}
+
+
+def company_context(profile: Dict, compact: bool = False) -> str:
+    """Company context block for LLM prompts (a short form when past proposals ground the agent)"""
+    if compact:
+        return f"""
+COMPANY CONTEXT:
+You are creating this proposal on behalf of {profile['name']}, a leading {profile['industry']} company ({profile['employees']}; {profile['headquarters']}).
+Specializations: {', '.join(profile['specializations'])}
+Certifications: {', '.join(profile['certifications'])}
+
+IMPORTANT: Always write the proposal from {profile['name']}'s perspective, highlighting our capabilities, experience, and value propositions.
+"""
+    return f"""
+COMPANY CONTEXT:
+You are creating this proposal on behalf of {profile['name']}, a leading {profile['industry']} company.
+
+Company Overview:
+- Founded: {profile['founded']}
+- Team: {profile['employees']}
+- Locations: {profile['headquarters']}
+
+Core Specializations:
+{chr(10).join([f"• {spec}" for spec in profile['specializations']])}
+
+Key Certifications & Compliance:
+{chr(10).join([f"• {cert}" for cert in profile['certifications']])}
+
+Portfolio Highlights:
+{chr(10).join([f"• {highlight}" for highlight in profile['portfolio_highlights']])}
+
+Competitive Advantages:
+{chr(10).join([f"• {diff}" for diff in profile['key_differentiators']])}
+
+Recent Achievements:
+{chr(10).join([f"• {achievement}" for achievement in profile['recent_achievements']])}
+
+IMPORTANT: Always write the proposal from {profile['name']}'s perspective, highlighting our capabilities, experience, and value propositions.
+"""
+
+
+class CompiledProfile:
+    """A profile's data plus its context blocks and prompt templates, rendered once"""
+
+    def __init__(self, profile_id: str, data: Dict, mtime: float = 0.0):
+        self.id = profile_id
+        self.data = data
+        self.mtime = mtime
+        self.version = hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        self.context = company_context(data)
+        self.compact_context = company_context(data, compact=True)
+        templates = dict(PROMPT_TEMPLATES, **data.get("prompts", {}))
+        self.templates = {name: string.Template(template.format(**data)) for name, template in templates.items()}
+        self.deliverables = {name: numbered_items(template.template) for name, template in self.templates.items()}
+
+    def render(self, name: str, **values) -> str:
+        """Prompt ``name`` with the per-request placeholders filled in"""
+        return self.templates[name].safe_substitute(values)
+
+
+class ProfileRegistry:
+    """Profiles loaded from a directory of JSON files, recompiled individually when they change"""
+
+    def __init__(self, directory: str = PROFILES_DIR, default_id: str = DEFAULT_PROFILE_ID):
+        self.directory = directory
+        self.default_id = default_id
+        self._profiles: Dict[str, CompiledProfile] = {}
+        self._lock = threading.Lock()
+        self._checked = 0.0
+        self.reload()
+
+    def reload(self) -> List[str]:
+        """Recompile profiles whose file changed; returns the ids that changed"""
+        try:
+            files = {Path(name).stem: os.path.join(self.directory, name)
+                     for name in os.listdir(self.directory) if name.endswith(".json")}
+        except OSError:
+            files = {}
+        changed = []
+        with self._lock:
+            for profile_id in set(self._profiles) - set(files):
+                del self._profiles[profile_id]
+                changed.append(profile_id)
+            for profile_id, path in files.items():
+                try:
+                    mtime = os.path.getmtime(path)
+                    current = self._profiles.get(profile_id)
+                    if current and current.mtime == mtime:
+                        continue
+                    with open(path, encoding="utf-8") as f:
+                        compiled = CompiledProfile(profile_id, json.load(f), mtime)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Ignoring invalid company profile {path}: {e}")
+                    continue
+                if current is None or current.version != compiled.version:
+                    changed.append(profile_id)
+                self._profiles[profile_id] = compiled
+            self._checked = time.monotonic()
+        return changed
+
+    def _maybe_reload(self):
+        if time.monotonic() - self._checked >= RELOAD_INTERVAL:
+            self.reload()
+
+    def ids(self) -> List[str]:
+        self._maybe_reload()
+        with self._lock:
+            return sorted(self._profiles)
+
+    def get(self, profile_id: Optional[str] = None) -> CompiledProfile:
+        """Compiled profile by id (falls back to the default profile, then any profile)"""
+        self._maybe_reload()
+        with self._lock:
+            profile = self._profiles.get(profile_id or self.default_id) or self._profiles.get(self.default_id)
+            if profile is None and self._profiles:
+                profile = self._profiles[sorted(self._profiles)[0]]
+        if profile is None:
+            raise LookupError(f"No company profiles found in {self.directory}")
+        return profile
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_profile_registry() -> ProfileRegistry:
+    """Process-wide registry shared by every session"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ProfileRegistry()
+        return _registry
+
+
+def benchmark(profiles: int = 20, iterations: int = 2000) -> List[Dict]:
+    """Per-request prompt assembly: re-formatting the profile every call vs. precompiled templates"""
+    base = get_profile_registry().get().data
+    variants = [CompiledProfile(f"unit-{i}", dict(base, name=f"{base['name']} Unit {i}")) for i in range(profiles)]
+    rfp_data = {"project_overview": {"title": "Benchmark", "description": "x" * 400}, "identified_components": ["a"] * 10}
+    agent = "Tech Lead Agent"
+
+    def per_call(profile: CompiledProfile) -> str:
+        template = string.Template(PROMPT_TEMPLATES[agent].format(**profile.data))
+        return template.safe_substitute(company_context=company_context(profile.data), rfp_data=rfp_data,
+                                        feedback_context="")
+
+    def compiled(profile: CompiledProfile) -> str:
+        return profile.render(agent, company_context=profile.context, rfp_data=rfp_data, feedback_context="")
+
+    results = []
+    for name, fn in [("format per request", per_call), ("precompiled", compiled)]:
+        started = time.perf_counter()
+        for i in range(iterations):
+            fn(variants[i % profiles])
+        elapsed = time.perf_counter() - started
+        results.append({"method": name, "profiles": profiles, "us_per_prompt": round(elapsed / iterations * 1e6, 1)})
+    return results
+
+
+if __name__ == "__main__":
+    for row in benchmark():
+        print(f"{row['method']:>20}: {row['us_per_prompt']:8.1f} us/prompt across {row['profiles']} profiles")
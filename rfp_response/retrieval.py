@@ -0,0 +1,279 @@
+"""Local retrieval over past proposal sections, keyed by agent.
+
+Each agent has a BM25 index over hashed term features built with NumPy (no external
+service). Approved/generated sections are split into chunks, persisted as JSONL under
+``RETRIEVAL_DIR`` and re-indexed on startup. Agents retrieve the top-k chunks for the
+current RFP within a token budget.
+
+Run ``python retrieval.py`` to benchmark retrieval latency and index size as the
+corpus grows.
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from text_utils import estimate_tokens, hash_token, tokenize
+
+RETRIEVAL_DIR = os.getenv("RFP_RETRIEVAL_DIR", os.path.join(os.path.expanduser("~"), ".rfp_response", "retrieval"))
+RETRIEVAL_TOP_K = int(os.getenv("RFP_RETRIEVAL_TOP_K", "3"))
+RETRIEVAL_TOKEN_BUDGET = int(os.getenv("RFP_RETRIEVAL_TOKEN_BUDGET", "800"))
+N_FEATURES = 2 ** 20
+CHUNK_TOKENS = 250
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+class SectionIndex:
+    """BM25 index over hashed term features for one agent's past sections"""
+
+    def __init__(self, n_features: int = N_FEATURES):
+        self.n_features = n_features
+        self.texts: List[str] = []
+        self.meta: List[Dict] = []
+        self._fingerprints = set()
+        self._doc_features: List[np.ndarray] = []
+        self._doc_counts: List[np.ndarray] = []
+        self._dirty = True
+        self._lock = threading.Lock()
+        # Inverted index (rebuilt lazily after additions)
+        self._terms = np.empty(0, dtype=np.int64)       # unique feature ids, sorted
+        self._term_starts = np.empty(0, dtype=np.int64)  # offset of each term's postings
+        self._postings_docs = np.empty(0, dtype=np.int32)
+        self._postings_tf = np.empty(0, dtype=np.float32)
+        self._doc_lengths = np.empty(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _vectorize(self, text: str):
+        ids = np.fromiter((hash_token(t, self.n_features) for t in tokenize(text)), dtype=np.int64)
+        return np.unique(ids, return_counts=True)
+
+    def add(self, text: str, meta: Optional[Dict] = None) -> bool:
+        """Add a section; returns False if identical text is already indexed"""
+        fingerprint = hashlib.sha1(text.strip().encode("utf-8")).hexdigest()
+        features, counts = self._vectorize(text)
+        with self._lock:
+            if fingerprint in self._fingerprints or len(features) == 0:
+                return False
+            self._fingerprints.add(fingerprint)
+            self.texts.append(text)
+            self.meta.append(meta or {})
+            self._doc_features.append(features)
+            self._doc_counts.append(counts.astype(np.float32))
+            self._dirty = True
+        return True
+
+    def _rebuild(self):
+        lengths = np.array([counts.sum() for counts in self._doc_counts], dtype=np.float32)
+        features = np.concatenate(self._doc_features)
+        counts = np.concatenate(self._doc_counts)
+        docs = np.repeat(np.arange(len(self._doc_features), dtype=np.int32),
+                         [len(f) for f in self._doc_features])
+        order = np.argsort(features, kind="stable")
+        features, self._postings_docs, self._postings_tf = features[order], docs[order], counts[order]
+        self._terms, self._term_starts = np.unique(features, return_index=True)
+        self._doc_lengths = lengths
+        self._dirty = False
+
+    def search(self, query: str, k: int = RETRIEVAL_TOP_K) -> List[Dict]:
+        """Top-k sections by BM25 score, best first"""
+        with self._lock:
+            if not self.texts:
+                return []
+            if self._dirty:
+                self._rebuild()
+            query_features, _ = self._vectorize(query)
+            if len(query_features) == 0:
+                return []
+
+            n_docs = len(self.texts)
+            avg_length = float(self._doc_lengths.mean())
+            scores = np.zeros(n_docs, dtype=np.float32)
+            positions = np.searchsorted(self._terms, query_features)
+            in_range = positions < len(self._terms)
+            positions, query_features = positions[in_range], query_features[in_range]
+            matched = positions[self._terms[positions] == query_features]
+            term_ends = np.append(self._term_starts[1:], len(self._postings_docs))
+            for position in matched:
+                start, end = self._term_starts[position], term_ends[position]
+                docs = self._postings_docs[start:end]
+                tf = self._postings_tf[start:end]
+                df = end - start
+                idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                norm = K1 * (1 - B + B * self._doc_lengths[docs] / avg_length)
+                np.add.at(scores, docs, idf * tf * (K1 + 1) / (tf + norm))
+
+            k = min(k, n_docs)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                {"text": self.texts[i], "score": float(scores[i]), **self.meta[i]}
+                for i in top if scores[i] > 0
+            ]
+
+    def nbytes(self) -> int:
+        """Memory held by the index arrays (excluding the raw section text)"""
+        with self._lock:
+            if self._dirty and self.texts:
+                self._rebuild()
+            arrays = [self._terms, self._term_starts, self._postings_docs, self._postings_tf, self._doc_lengths]
+            return int(sum(a.nbytes for a in arrays))
+
+
+def chunk_section(text: str, max_tokens: int = CHUNK_TOKENS) -> List[str]:
+    """Split an agent output into heading/paragraph-aligned chunks of ~max_tokens"""
+    blocks = [b.strip() for b in re.split(r"\n\s*\n|\n(?=#{1,6}\s)", text) if b.strip()]
+    chunks, current = [], []
+    for block in blocks:
+        if current and estimate_tokens("\n\n".join(current + [block])) > max_tokens:
+            chunks.append("\n\n".join(current))
+            current = []
+        current.append(block)
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def rfp_query_text(rfp_data: Dict) -> str:
+    """Retrieval query built from the parsed RFP (overview, requirements, components)"""
+    parts = []
+    overview = rfp_data.get("project_overview") or {}
+    if isinstance(overview, dict):
+        parts.extend(str(overview.get(key, "")) for key in ("title", "type", "description"))
+    for field in ("technical_requirements", "functional_requirements", "compliance_requirements",
+                  "deliverables", "identified_components", "risk_factors"):
+        value = rfp_data.get(field) or []
+        if isinstance(value, list):
+            parts.extend(str(item) for item in value)
+    return "\n".join(part for part in parts if part)
+
+
+class RetrievalStore:
+    """Per-agent section indexes persisted as JSONL under ``root``"""
+
+    def __init__(self, root: str = RETRIEVAL_DIR):
+        self.root = root
+        self.indexes: Dict[str, SectionIndex] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _path(self, agent_name: str) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "_", agent_name.lower()).strip("_")
+        return os.path.join(self.root, f"{slug}.jsonl")
+
+    def _load(self):
+        if not os.path.isdir(self.root):
+            return
+        for filename in os.listdir(self.root):
+            if not filename.endswith(".jsonl"):
+                continue
+            with open(os.path.join(self.root, filename), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    agent = record.pop("agent", None)
+                    text = record.pop("text", "")
+                    if agent and text:
+                        self._index(agent).add(text, record)
+
+    def _index(self, agent_name: str) -> SectionIndex:
+        with self._lock:
+            if agent_name not in self.indexes:
+                self.indexes[agent_name] = SectionIndex()
+            return self.indexes[agent_name]
+
+    def add_section(self, agent_name: str, output: str, proposal_title: str = "") -> int:
+        """Index an approved/generated agent output; returns the number of new chunks"""
+        index = self._index(agent_name)
+        added = []
+        for chunk in chunk_section(output):
+            meta = {"proposal": proposal_title, "added": time.strftime("%Y-%m-%d")}
+            if index.add(chunk, meta):
+                added.append({"agent": agent_name, "text": chunk, **meta})
+        if added:
+            os.makedirs(self.root, exist_ok=True)
+            with self._lock, open(self._path(agent_name), "a", encoding="utf-8") as f:
+                for record in added:
+                    f.write(json.dumps(record) + "\n")
+        return len(added)
+
+    def retrieve(self, agent_name: str, rfp_data: Dict, k: int = RETRIEVAL_TOP_K,
+                 token_budget: int = RETRIEVAL_TOKEN_BUDGET) -> List[Dict]:
+        """Top-k past sections for this agent that fit within ``token_budget``"""
+        index = self.indexes.get(agent_name)
+        if index is None or len(index) == 0:
+            return []
+        selected, used = [], 0
+        for hit in index.search(rfp_query_text(rfp_data), k):
+            tokens = estimate_tokens(hit["text"])
+            if used + tokens > token_budget:
+                continue
+            selected.append(hit)
+            used += tokens
+        return selected
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {agent: {"sections": len(index), "index_bytes": index.nbytes()}
+                for agent, index in self.indexes.items()}
+
+
+_retrieval_store = None
+_store_lock = threading.Lock()
+
+
+def get_retrieval_store() -> RetrievalStore:
+    global _retrieval_store
+    with _store_lock:
+        if _retrieval_store is None:
+            _retrieval_store = RetrievalStore()
+        return _retrieval_store
+
+
+def benchmark(sizes=(100, 1000, 5000), queries: int = 50, seed: int = 7):
+    """Retrieval latency and index size for synthetic corpora of increasing size"""
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(20000)] + [
+        "cloud", "aws", "azure", "security", "react", "api", "hipaa", "gdpr", "pci", "kubernetes",
+        "microservices", "mobile", "analytics", "payment", "integration", "compliance", "migration",
+    ]
+    results = []
+    for size in sizes:
+        index = SectionIndex()
+        started = time.perf_counter()
+        for _ in range(size):
+            index.add(" ".join(rng.choices(vocabulary, k=200)))
+        index.nbytes()  # forces the build
+        build_seconds = time.perf_counter() - started
+
+        latencies = []
+        for _ in range(queries):
+            query = " ".join(rng.choices(vocabulary, k=60))
+            started = time.perf_counter()
+            index.search(query, RETRIEVAL_TOP_K)
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+        results.append({
+            "sections": size,
+            "build_s": round(build_seconds, 3),
+            "p50_ms": round(latencies[len(latencies) // 2], 3),
+            "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+            "index_mb": round(index.nbytes() / 1e6, 2),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    for row in benchmark():
+        print(row)
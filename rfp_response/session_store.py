@@ -0,0 +1,375 @@
+"""Session storage layer for the proposal generator.
+
+Large per-session values (the raw upload, the extracted RFP text, agent outputs
+and the consolidated document) are written once to a content-addressed store on
+disk and referenced from ``st.session_state`` by their SHA-256 digest. Sessions
+that stay idle longer than ``SESSION_IDLE_SECONDS`` have their blobs released.
+
+Reference counts live in each process, so every process holding a reference to a
+blob also keeps a ``<digest>.ref-<pid>`` marker next to it; a blob is only deleted
+once no live process has a marker for it.
+"""
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, List, MutableMapping, Optional
+
+BLOB_DIR = os.getenv("RFP_BLOB_DIR", os.path.join(tempfile.gettempdir(), "rfp_response_blobs"))
+SESSION_IDLE_SECONDS = int(os.getenv("RFP_SESSION_IDLE_SECONDS", "1800"))
+EVICTION_INTERVAL_SECONDS = 60
+REF_MARKER = ".ref-"
+
+
+def _pid_alive(pid: int) -> bool:
+    if sys.platform == "win32":
+        return True  # os.kill would terminate the process; a stale marker only keeps a blob
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, owned by another user
+    return True
+
+
+class BlobStore:
+    """Content-addressed, reference-counted blob store on local disk"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._refs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _marker(self, digest: str) -> str:
+        return f"{self._path(digest)}{REF_MARKER}{os.getpid()}"
+
+    def _take_ref(self, digest: str):
+        """Count one reference (caller holds the lock); the first one also writes this process's marker"""
+        count = self._refs.get(digest, 0) + 1
+        self._refs[digest] = count
+        if count == 1:
+            os.makedirs(os.path.dirname(self._path(digest)), exist_ok=True)
+            open(self._marker(digest), "a").close()
+
+    def _referenced_elsewhere(self, digest: str) -> bool:
+        """Whether another live process holds a marker for the blob (removing markers of dead ones)"""
+        shard_dir = os.path.dirname(self._path(digest))
+        try:
+            names = os.listdir(shard_dir)
+        except OSError:
+            return False
+        referenced = False
+        for name in names:
+            if not name.startswith(digest + REF_MARKER):
+                continue
+            pid = int(name.rsplit("-", 1)[1])
+            if pid == os.getpid():
+                continue
+            if _pid_alive(pid):
+                referenced = True
+            else:
+                try:
+                    os.remove(os.path.join(shard_dir, name))
+                except OSError:
+                    pass
+        return referenced
+
+    def put(self, data: bytes, incref: bool = False) -> str:
+        """Store bytes (once per distinct content) and return their digest, optionally taking a reference"""
+        # Existence check, write and incref share the lock with decref's delete, so another
+        # session releasing identical content cannot remove the blob before it is referenced
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        with self._lock:
+            if incref:
+                self._take_ref(digest)  # marker first, so another process's decref keeps the blob
+            try:
+                os.utime(path)  # recently stored content is never swept by age
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        try:
+            with open(self._path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def size(self, digest: str) -> int:
+        try:
+            return os.path.getsize(self._path(digest))
+        except OSError:
+            return 0
+
+    def incref(self, digest: str):
+        with self._lock:
+            self._take_ref(digest)
+
+    def decref(self, digest: str):
+        """Drop one reference and delete the blob once nothing points at it"""
+        with self._lock:
+            count = self._refs.get(digest, 0) - 1
+            if count > 0:
+                self._refs[digest] = count
+                return
+            self._refs.pop(digest, None)
+            try:
+                os.remove(self._marker(digest))
+            except OSError:
+                pass
+            if self._referenced_elsewhere(digest):
+                return
+            try:
+                os.remove(self._path(digest))
+            except OSError:
+                pass
+
+    def sweep_unreferenced(self, max_age_seconds: int):
+        """Remove blobs left behind by earlier processes or dropped caches"""
+        cutoff = time.time() - max_age_seconds
+        for shard in os.listdir(self.root):
+            shard_dir = os.path.join(self.root, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                if REF_MARKER in name:
+                    continue  # markers of dead processes are removed with their blob's check
+                path = os.path.join(shard_dir, name)
+                # Checked under the lock so a blob referenced by a concurrent put survives
+                with self._lock:
+                    digest = name.split(".", 1)[0]
+                    if digest in self._refs or self._referenced_elsewhere(digest):
+                        continue
+                    try:
+                        if os.path.getmtime(path) < cutoff:
+                            os.remove(path)
+                    except OSError:
+                        pass
+
+
+class SessionStore:
+    """Named blob references owned by a single Streamlit session"""
+
+    def __init__(self, session_id: str, blobs: BlobStore):
+        self.session_id = session_id
+        self.blobs = blobs
+        self.refs: Dict[str, str] = {}
+        self.last_access = time.time()
+        self.evicted = False
+        self.outputs = AgentOutputs(self)
+        self._lock = threading.Lock()
+
+    def touch(self):
+        self.last_access = time.time()
+
+    def put_bytes(self, name: str, data: bytes) -> str:
+        with self._lock:
+            previous = self.refs.get(name)
+            if previous == hashlib.sha256(data).hexdigest():
+                return previous
+            digest = self.blobs.put(data, incref=True)
+            self.refs[name] = digest
+        if previous:
+            self.blobs.decref(previous)
+        return digest
+
+    def get_bytes(self, name: str) -> Optional[bytes]:
+        digest = self.refs.get(name)
+        if digest is None:
+            return None
+        return self.blobs.get(digest)
+
+    def put_text(self, name: str, text: str) -> str:
+        return self.put_bytes(name, text.encode("utf-8"))
+
+    def get_text(self, name: str, default: str = "") -> str:
+        data = self.get_bytes(name)
+        return data.decode("utf-8") if data is not None else default
+
+    def has(self, name: str) -> bool:
+        return name in self.refs
+
+    def digest(self, name: str) -> Optional[str]:
+        return self.refs.get(name)
+
+    def delete(self, name: str):
+        with self._lock:
+            digest = self.refs.pop(name, None)
+        if digest:
+            self.blobs.decref(digest)
+
+    def names(self, prefix: str = "") -> List[str]:
+        return [name for name in list(self.refs) if name.startswith(prefix)]
+
+    def release(self):
+        """Drop every blob this session references"""
+        for name in list(self.refs):
+            self.delete(name)
+
+    def memory_report(self, session_state=None) -> Dict[str, int]:
+        """Bytes held in process memory vs. offloaded to the blob store"""
+        offloaded = sum(self.blobs.size(digest) for digest in set(self.refs.values()))
+        in_memory = 0
+        if session_state is not None:
+            for key in list(session_state.keys()):
+                in_memory += deep_sizeof(session_state[key])
+        return {
+            "in_memory_bytes": in_memory,
+            "offloaded_bytes": offloaded,
+            "blob_count": len(self.refs),
+        }
+
+
+class AgentOutputs(MutableMapping):
+    """Single canonical copy of agent outputs, stored as session blobs.
+
+    Used as ``ProposalState["agent_outputs"]`` so existing ``state["agent_outputs"][name]``
+    reads and writes keep working while only digests stay in memory.
+    """
+
+    PREFIX = "output:"
+
+    def __init__(self, store: SessionStore):
+        self._store = store
+
+    def __getitem__(self, agent_name: str) -> str:
+        if not self._store.has(self.PREFIX + agent_name):
+            raise KeyError(agent_name)
+        return self._store.get_text(self.PREFIX + agent_name)
+
+    def __setitem__(self, agent_name: str, output: str):
+        self._store.put_text(self.PREFIX + agent_name, output or "")
+
+    def __delitem__(self, agent_name: str):
+        if not self._store.has(self.PREFIX + agent_name):
+            raise KeyError(agent_name)
+        self._store.delete(self.PREFIX + agent_name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([name[len(self.PREFIX):] for name in self._store.names(self.PREFIX)])
+
+    def __len__(self) -> int:
+        return len(self._store.names(self.PREFIX))
+
+    def __contains__(self, agent_name) -> bool:
+        return self._store.has(self.PREFIX + str(agent_name))
+
+    def __repr__(self) -> str:
+        return f"AgentOutputs({list(self)})"
+
+
+class StoredUpload:
+    """Lightweight stand-in for an ``UploadedFile`` whose bytes live in the blob store"""
+
+    def __init__(self, store: SessionStore, name: str, type: str, size: int, data: bytes, source_id: str = ""):
+        self.name = name
+        self.type = type
+        self.size = size
+        self.source_id = source_id
+        self._store = store
+        self.digest = store.put_bytes("uploaded_file", data)
+
+    def read(self) -> bytes:
+        return self._store.get_bytes("uploaded_file") or b""
+
+    def getvalue(self) -> bytes:
+        return self.read()
+
+
+def deep_sizeof(obj, _seen=None) -> int:
+    """Approximate recursive size of plain containers held in session state"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, _seen) + deep_sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, _seen) for item in obj)
+    elif isinstance(obj, SessionStore):
+        size += deep_sizeof(obj.refs, _seen)
+    return size
+
+
+_blob_store = None
+_sessions: Dict[str, SessionStore] = {}
+_evicted_ids = set()
+_registry_lock = threading.Lock()
+_last_eviction = 0.0
+
+
+def get_blob_store() -> BlobStore:
+    global _blob_store
+    with _registry_lock:
+        if _blob_store is None:
+            _blob_store = BlobStore(BLOB_DIR)
+        return _blob_store
+
+
+def get_session_store(session_id: str) -> SessionStore:
+    """Get or create the store for a session and mark it as recently used"""
+    blobs = get_blob_store()
+    with _registry_lock:
+        store = _sessions.get(session_id)
+        if store is None:
+            store = SessionStore(session_id, blobs)
+            _sessions[session_id] = store
+    store.touch()
+    return store
+
+
+def consume_eviction(session_id: str) -> bool:
+    """True (once) if the session's blobs were evicted while it was idle"""
+    with _registry_lock:
+        if session_id in _evicted_ids:
+            _evicted_ids.discard(session_id)
+            return True
+    return False
+
+
+def drop_session_store(session_id: str):
+    with _registry_lock:
+        store = _sessions.pop(session_id, None)
+    if store:
+        store.release()
+
+
+def evict_idle_sessions(max_idle_seconds: int = SESSION_IDLE_SECONDS, force: bool = False) -> int:
+    """Release blobs of sessions idle longer than ``max_idle_seconds``.
+
+    Runs at most once per ``EVICTION_INTERVAL_SECONDS`` unless forced. Returns the number
+    of sessions evicted.
+    """
+    global _last_eviction
+    now = time.time()
+    if not force and now - _last_eviction < EVICTION_INTERVAL_SECONDS:
+        return 0
+    _last_eviction = now
+
+    with _registry_lock:
+        idle = [sid for sid, store in _sessions.items() if now - store.last_access > max_idle_seconds]
+        evicted = [_sessions.pop(sid) for sid in idle]
+    for store in evicted:
+        store.release()
+        store.evicted = True
+        _evicted_ids.add(store.session_id)
+
+    get_blob_store().sweep_unreferenced(max_idle_seconds)
+    return len(evicted)
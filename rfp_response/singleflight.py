@@ -0,0 +1,89 @@
+"""Process-wide coalescing of identical in-flight work.
+
+Sessions that open the same RFP (tutorial samples, a shared bid) would otherwise each
+extract it, parse it and send identical agent prompts at the same time. A
+``SingleFlight`` group runs the first caller for a fingerprint and makes every
+concurrent caller with the same fingerprint wait for that one execution and share its
+result (or its exception). Nothing is cached once the call finishes; it only
+deduplicates work that overlaps in time.
+"""
+import copy
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List
+
+
+def fingerprint(*parts) -> str:
+    """Stable hash of a request's inputs"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """One in-flight execution per key; concurrent duplicates wait for it"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.counters = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key: str, fn: Callable):
+        with self._lock:
+            self.counters["calls"] += 1
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.counters["executions"] += 1
+            else:
+                self.counters["coalesced"] += 1
+        if not leader:
+            # Each caller gets its own copy, the results are mutated downstream
+            return copy.deepcopy(future.result())
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                self.counters["errors"] += 1
+                self._calls.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._calls.pop(key, None)
+        future.set_result(result)
+        return copy.deepcopy(result)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self.counters, group=self.name, in_flight=len(self._calls))
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_singleflight(name: str) -> SingleFlight:
+    """Process-wide group for one kind of work ("extraction", "llm", ...)"""
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = SingleFlight(name)
+        return _groups[name]
+
+
+def singleflight_stats() -> List[Dict]:
+    """Counters of every group, for display"""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return [
+        {"Group": s["group"], "Calls": s["calls"], "Executions": s["executions"],
+         "Coalesced": s["coalesced"], "Errors": s["errors"], "In Flight": s["in_flight"]}
+        for s in (group.stats() for group in groups)
+    ]
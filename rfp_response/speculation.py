@@ -0,0 +1,123 @@
+"""Speculative prefetch of agent runs.
+
+While the user reviews the parse results, agents whose prompts are already fully
+determined (parsed RFP, their source sections, no feedback yet) are run on a
+background pool. When the user dispatches, a finished (or in-flight) result is
+adopted instead of making a new call, as long as the agent's prompt inputs still hash
+to the same key. Re-parsing or giving an agent feedback changes the key, so stale
+results are discarded and queued runs cancelled. Tokens of adopted results count as
+saved; tokens of discarded results count as wasted.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+SPECULATIVE_WORKERS = int(os.getenv("RFP_SPECULATIVE_WORKERS", "3"))
+
+_executor = ThreadPoolExecutor(max_workers=SPECULATIVE_WORKERS, thread_name_prefix="agent-speculation")
+
+
+def speculation_key(*inputs) -> str:
+    """Stable hash of everything that goes into an agent's prompt"""
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class SpeculativeRunner:
+    """Background agent runs for one session, adopted or discarded by prompt key"""
+
+    def __init__(self):
+        self._runs: Dict[str, Tuple[str, Future]] = {}  # agent -> (key, future)
+        self._lock = threading.Lock()
+        self.counters = {
+            "started": 0, "adopted": 0, "discarded": 0, "cancelled": 0,
+            "tokens_saved": 0, "tokens_wasted": 0, "seconds_saved": 0.0,
+        }
+
+    def start(self, jobs: Dict[str, str], generate: Callable[[str], Tuple[str, int]]):
+        """Start ``generate(agent)`` for each agent whose key isn't already running.
+
+        ``jobs`` maps agent name -> speculation key; ``generate`` returns (output, tokens used).
+        """
+        for agent, key in jobs.items():
+            with self._lock:
+                current = self._runs.get(agent)
+                if current and current[0] == key:
+                    continue
+            if current:
+                self._discard(agent)
+            future = _executor.submit(self._run, agent, generate)
+            with self._lock:
+                self._runs[agent] = (key, future)
+                self.counters["started"] += 1
+
+    @staticmethod
+    def _run(agent: str, generate: Callable[[str], Tuple[str, int]]) -> Dict:
+        started = time.perf_counter()
+        output, tokens = generate(agent)
+        return {"output": output, "tokens": tokens, "seconds": time.perf_counter() - started}
+
+    def adopt(self, agent: str, key: str) -> Optional[str]:
+        """Speculative output for ``agent`` if it was computed from the same inputs (waits if in flight)"""
+        with self._lock:
+            current = self._runs.get(agent)
+        if not current:
+            return None
+        if current[0] != key:
+            self._discard(agent)
+            return None
+        with self._lock:
+            self._runs.pop(agent, None)
+        try:
+            result = current[1].result()
+        except (CancelledError, Exception):
+            return None  # the caller falls back to a normal run
+        with self._lock:
+            self.counters["adopted"] += 1
+            self.counters["tokens_saved"] += result["tokens"]
+            self.counters["seconds_saved"] += result["seconds"]
+        return result["output"]
+
+    def _discard(self, agent: str):
+        with self._lock:
+            current = self._runs.pop(agent, None)
+            if not current:
+                return
+            self.counters["discarded"] += 1
+        future = current[1]
+        if future.cancel():
+            with self._lock:
+                self.counters["cancelled"] += 1
+        else:
+            future.add_done_callback(self._count_wasted)
+
+    def _count_wasted(self, future: Future):
+        try:
+            tokens = future.result()["tokens"]
+        except (CancelledError, Exception):
+            return
+        with self._lock:
+            self.counters["tokens_wasted"] += tokens
+
+    def discard_all(self):
+        """Drop every pending/finished speculative run (cancelling the ones not started yet)"""
+        with self._lock:
+            agents = list(self._runs)
+        for agent in agents:
+            self._discard(agent)
+
+    def pending(self) -> List[str]:
+        with self._lock:
+            return [agent for agent, (_, future) in self._runs.items() if not future.done()]
+
+    def ready(self) -> List[str]:
+        with self._lock:
+            return [agent for agent, (_, future) in self._runs.items()
+                    if future.done() and not future.cancelled() and future.exception() is None]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self.counters)
@@ -0,0 +1,45 @@
+"""Parallel generation of an agent's numbered deliverables.
+
+Agent prompts end with a numbered list of what the section must cover ("1. Recommended
+technology stack ... 4. Development methodology"). In parallel mode each item becomes
+its own request: the full agent prompt (identical across the sub-requests, so the
+service can reuse the shared prefix) followed by an instruction to write only that
+item. The sub-requests run concurrently and their outputs are joined in item order, so
+an agent takes roughly as long as its longest item instead of the sum of all of them.
+"""
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+SUBSECTION_WORKERS = int(os.getenv("RFP_SUBSECTION_WORKERS", "8"))
+
+SUBSECTION_INSTRUCTION = """
+
+Write ONLY item {number} of the list above: "{item}"
+The other items are written separately and will be combined with yours, so do not cover them and do not add an introduction or closing. Start with a "### {number}. " heading."""
+
+_ITEM_RE = re.compile(r"^(\d+)\.\s+(.+)$")
+
+_executor = ThreadPoolExecutor(max_workers=SUBSECTION_WORKERS, thread_name_prefix="agent-subsection")
+
+
+def numbered_items(template: str) -> List[str]:
+    """The first run of lines numbered 1., 2., 3., ... in a prompt template (empty if fewer than two)"""
+    items: List[str] = []
+    for line in template.splitlines():
+        match = _ITEM_RE.match(line.strip())
+        if match and int(match.group(1)) == len(items) + 1:
+            items.append(match.group(2).strip())
+        elif items:
+            break
+    return items if len(items) >= 2 else []
+
+
+def generate_subsections(prompt: str, items: List[str], complete: Callable[[str], str]) -> str:
+    """Run one ``complete(sub_prompt)`` per item concurrently and join the results in order"""
+    futures = [
+        _executor.submit(complete, prompt + SUBSECTION_INSTRUCTION.format(number=number, item=item))
+        for number, item in enumerate(items, 1)
+    ]
+    return "\n\n".join(future.result().strip() for future in futures)
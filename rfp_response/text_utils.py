@@ -0,0 +1,46 @@
+"""Small text helpers shared by the local (non-LLM) analysis modules."""
+import math
+import re
+import zlib
+from typing import List
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:[.+#/-][a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could for from has have in into is it its of on or our
+shall should such that the their them there these this those to was we were will with within
+you your must may all any each other than then also per via
+""".split())
+
+
+def tokenize(text: str, drop_stopwords: bool = True) -> List[str]:
+    """Lowercase word tokens (keeps things like "ci/cd", "node.js", "c#" together)"""
+    tokens = _WORD_RE.findall(text.lower())
+    if drop_stopwords:
+        tokens = [token for token in tokens if token not in STOPWORDS]
+    return tokens
+
+
+def hash_token(token: str, n_features: int) -> int:
+    """Stable (process-independent) feature id for a token"""
+    return zlib.crc32(token.encode("utf-8")) % n_features
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (~4 characters per token for English prose)"""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+_SUFFIXES = ("ments", "ment", "ances", "ance", "ences", "ence", "ions", "ion", "ings", "ing",
+             "ants", "ant", "ents", "ent", "ies", "ied", "ed", "es", "s")
+
+
+def stem(token: str) -> str:
+    """Crude suffix stripping so "compliance"/"compliant" or "integrate"/"integration" match"""
+    if len(token) <= 4 or not token.isalpha():
+        return token
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 4 and not token.endswith("ss"):
+            token = token[:-len(suffix)] + ("y" if suffix in ("ies", "ied") else "")
+            break
+    return token[:-1] if token.endswith("e") and len(token) > 4 else token